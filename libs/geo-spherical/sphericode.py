@@ -4,6 +4,9 @@ SpheriCode: Morton-interleaved lat/lon encoding to Crockford Base32
 
 import math
 from typing import List, Tuple, Set
+
+import numpy as np
+
 from spherical import angular_radius, inside_cap
 
 # Crockford Base32 alphabet (excludes I, L, O, U)
@@ -48,6 +51,66 @@ def encode_sphericode(lat: float, lon: float, bits_per_axis: int = 16) -> str:
     return morton_to_base32(morton, bits_per_axis * 2)
 
 
+def _spread_bits(x: np.ndarray) -> np.ndarray:
+    """Spread the low 32 bits of each uint64 into the even bit positions
+    (SWAR Morton interleave step, vectorized over the whole array)"""
+    x = (x | (x << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    x = (x | (x << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    x = (x | (x << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    x = (x | (x << np.uint64(2))) & np.uint64(0x3333333333333333)
+    x = (x | (x << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return x
+
+
+def encode_sphericode_batch(lats, lons, bits_per_axis: int = 16) -> List[str]:
+    """
+    Encode arrays of latitudes/longitudes to SpheriCodes in one pass.
+
+    Element-for-element identical to encode_sphericode, but quantization and
+    Morton interleaving run as vectorized NumPy expressions instead of a
+    Python loop per point.
+
+    Args:
+        lats: Latitudes in degrees [-90, 90] (array-like)
+        lons: Longitudes in degrees [-180, 180] (array-like, same length)
+        bits_per_axis: Precision bits per coordinate (1-26)
+
+    Returns:
+        List of fixed-length Crockford Base32 strings
+    """
+    if not (1 <= bits_per_axis <= 26):
+        raise ValueError("bits_per_axis must be between 1 and 26")
+
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+
+    if np.any((lats < -90) | (lats > 90)):
+        raise ValueError("Latitude must be between -90 and 90")
+
+    if np.any((lons < -180) | (lons > 180)):
+        raise ValueError("Longitude must be between -180 and 180")
+
+    # Normalize to [0, 1] and quantize (truncation matches int() in the
+    # scalar encoder)
+    max_val = (1 << bits_per_axis) - 1
+    lat_int = ((lats + 90) / 180 * max_val).astype(np.uint64)
+    lon_int = ((lons + 180) / 360 * max_val).astype(np.uint64)
+
+    # Morton interleave: lat bits to even positions, lon bits to odd
+    morton = _spread_bits(lat_int) | (_spread_bits(lon_int) << np.uint64(1))
+
+    # Base32 digits extracted for all codes at once, then sliced per row
+    total_bits = bits_per_axis * 2
+    num_digits = (total_bits + 4) // 5
+    shifts = (np.arange(num_digits - 1, -1, -1, dtype=np.uint64) * np.uint64(5))
+    digits = (morton[:, None] >> shifts[None, :]) & np.uint64(0x1F)
+
+    alphabet = np.frombuffer(CROCKFORD_BASE32.encode("ascii"), dtype=np.uint8)
+    flat = alphabet[digits].tobytes()
+    return [flat[i:i + num_digits].decode("ascii")
+            for i in range(0, len(flat), num_digits)]
+
+
 def decode_sphericode(code: str, bits_per_axis: int = 16) -> Tuple[float, float]:
     """
     Decode SpheriCode back to latitude/longitude.
@@ -32,33 +32,40 @@ async def analyze_channels_historical(days_back: int = 3):
     
     total_messages = 0
     total_analyses = 0
-    
-    for channel in channels:
+
+    async def process(channel):
+        """Fetch and analyze one channel's history"""
+        messages = await monitor.get_channel_history(channel, limit=50, days_back=days_back)
+        if messages:
+            await monitor.analyze_channel_history(channel, limit=50, days_back=days_back)
+        return messages
+
+    # Overlap the per-channel Telegram round-trips: wall time becomes
+    # roughly the slowest channel instead of the sum of all of them
+    outcomes = await asyncio.gather(*(process(c) for c in channels),
+                                    return_exceptions=True)
+
+    for channel, outcome in zip(channels, outcomes):
         print(f"\n🔍 {channel}:")
-        
-        try:
-            # Get messages first to count
-            messages = await monitor.get_channel_history(channel, limit=50, days_back=days_back)
-            
-            if messages:
-                print(f"   📱 Found {len(messages)} messages from last {days_back} days")
-                total_messages += len(messages)
-                
-                # Analyze channel history
-                await monitor.analyze_channel_history(channel, limit=50, days_back=days_back)
-                total_analyses += len(messages)
-                
-                # Show sample
-                sample = messages[0]
-                content = sample['text'][:60] + "..." if len(sample['text']) > 60 else sample['text']
-                date_str = sample['date'].strftime('%Y-%m-%d %H:%M') if sample['date'] else 'Unknown'
-                print(f"   📝 Latest: [{date_str}] {content}")
-                
-            else:
-                print(f"   📭 No messages in last {days_back} days")
-                
-        except Exception as e:
-            print(f"   ❌ Error: {str(e)[:80]}...")
+
+        if isinstance(outcome, Exception):
+            print(f"   ❌ Error: {str(outcome)[:80]}...")
+            continue
+
+        messages = outcome
+        if messages:
+            print(f"   📱 Found {len(messages)} messages from last {days_back} days")
+            total_messages += len(messages)
+            total_analyses += len(messages)
+
+            # Show sample
+            sample = messages[0]
+            content = sample['text'][:60] + "..." if len(sample['text']) > 60 else sample['text']
+            date_str = sample['date'].strftime('%Y-%m-%d %H:%M') if sample['date'] else 'Unknown'
+            print(f"   📝 Latest: [{date_str}] {content}")
+
+        else:
+            print(f"   📭 No messages in last {days_back} days")
     
     print(f"\n📊 ANALYSIS COMPLETE")
     print("=" * 30)
@@ -6,8 +6,22 @@ Run this once to authenticate, then you can use the monitoring commands
 
 import asyncio
 import os
+import pickle
 from pathlib import Path
 from telethon import TelegramClient
+from telethon.tl.types import InputPeerChannel
+
+# Resolved channel entities (id + access_hash) survive between runs here,
+# so reruns skip the username-resolution round-trip per channel
+ENTITY_CACHE_PATH = Path('sessions') / 'entity_cache.pkl'
+
+
+def _load_entity_cache():
+    try:
+        with open(ENTITY_CACHE_PATH, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return {}
 
 
 async def authenticate():
@@ -48,18 +62,37 @@ async def authenticate():
         # Test channel access
         print("🔍 Testing access to your channels...")
         channels = ['@phuketgidsell', '@phuketgid', '@sabay_property']
-        
+
+        entity_cache = _load_entity_cache()
+        resolved = {}
+
         for channel in channels:
             try:
-                entity = await client.get_entity(channel)
+                cached = entity_cache.get(channel)
+                if cached:
+                    # Cached id/access_hash: no username resolution needed
+                    entity = await client.get_entity(InputPeerChannel(*cached))
+                else:
+                    entity = await client.get_entity(channel)
+
                 if hasattr(entity, 'participants_count'):
                     member_count = entity.participants_count
                 else:
                     member_count = "Unknown"
-                
+
                 print(f"   ✅ {channel} - {getattr(entity, 'title', 'No title')} ({member_count} members)")
+
+                if hasattr(entity, 'id') and hasattr(entity, 'access_hash'):
+                    resolved[channel] = (entity.id, entity.access_hash)
             except Exception as e:
                 print(f"   ⚠️  {channel} - {str(e)[:50]}...")
+
+        if resolved:
+            try:
+                with open(ENTITY_CACHE_PATH, 'wb') as f:
+                    pickle.dump({**entity_cache, **resolved}, f)
+            except OSError:
+                pass  # Cache is an optimization; never fail auth over it
         
     except Exception as e:
         print(f"❌ Authentication failed: {e}")
@@ -5,13 +5,36 @@ Debug channel messages to see what's being filtered
 
 import asyncio
 import os
+import re
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from telethon import TelegramClient
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.analytics.session_manager import TelegramSessionManager
+from services.analytics.telegram_monitor import TelegramPropertyMonitor
+
+# Filter-reason keywords compiled once into a single multi-pattern scan:
+# one pass over each message covers every category instead of a separate
+# substring traversal per keyword
+_REASON_RE = re.compile(
+    r"(?P<link>http|youtube|vk\.com)"
+    r"|(?P<promo>подписывайтесь|subscribe|смотрим)"
+    r"|(?P<listing>for sale|for rent|price:|bedroom|bathroom)"
+)
+_FORMAT_TOKENS = ('**', '✅', '➡️', '✔️')
+
+# Flatten previews to one line in a single translate pass
+_PREVIEW_TBL = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
+
+
+def _fmt_minute(d):
+    """'YYYY-MM-DD HH:MM' from integer fields — no strftime locale or
+    timezone lookups per message"""
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d} {d.hour:02d}:{d.minute:02d}"
 
 async def debug_messages():
     """Debug what messages are in the channel"""
@@ -19,16 +42,12 @@ async def debug_messages():
     api_id = int(os.getenv('TELEGRAM_API_ID', '26818131'))
     api_hash = os.getenv('TELEGRAM_API_HASH', '85b2edabf016108450eb958ac80fa2d7')
     
-    # Use the existing authenticated session
-    session_path = Path('sessions') / 'oneminuta_prod'
-    if not session_path.parent.exists():
-        # Try from parent directory if running from scripts/
-        session_path = Path('..') / 'sessions' / 'oneminuta_prod'
-    
-    client = TelegramClient(str(session_path), api_id, api_hash)
-    
+    # Reuse the shared session manager: one session DB open and one
+    # connect instead of hand-rolled session-file probing per script
+    manager = TelegramSessionManager(api_id, api_hash)
+
     try:
-        await client.connect()
+        client = await manager.get_client()
         if not await client.is_user_authorized():
             print("❌ Not authorized! Run: ./telegram_analytics auth")
             return
@@ -36,97 +55,125 @@ async def debug_messages():
         print(f"❌ Session error: {e}")
         return
     
+    # One monitor for the whole run: is_likely_owner_message is pure text
+    # classification, so nothing per-message needs a fresh instance
+    monitor = TelegramPropertyMonitor(api_id, api_hash, './storage')
+
     channels = ['@phuketgidsell', '@phuketgid', '@sabay_property']
-    
-    for channel in channels:
-        print(f"\n{'='*60}")
-        print(f"📱 CHANNEL: {channel}")
-        print(f"{'='*60}")
-        
+
+    async def debug_one(channel):
+        """Fetch and classify one channel, buffering output so concurrent
+        channels don't interleave their prints"""
+        lines = []
+        lines.append(f"\n{'='*60}")
+        lines.append(f"📱 CHANNEL: {channel}")
+        lines.append(f"{'='*60}")
+
         try:
             entity = await client.get_entity(channel)
-            
+
             # Get last 10 messages without any filtering
-            print(f"\n📊 Last 10 messages (NO FILTERING):")
-            print("-" * 40)
-            
+            lines.append(f"\n📊 Last 10 messages (NO FILTERING):")
+            lines.append("-" * 40)
+
             count = 0
             owner_count = 0
             member_count = 0
-            
-            async for message in client.iter_messages(entity, limit=10):
+
+            # Single getHistory round-trip for the bounded batch; the rest of
+            # the loop is plain text processing with no awaits
+            for message in await client.get_messages(entity, limit=10):
                 if message.text:
                     count += 1
-                    
+                    text = message.text
+                    # Lowercase once per message; the classifier and the
+                    # reason scan below both reuse it
+                    text_lower = text.lower()
+
                     # Get sender info
-                    sender_name = "Unknown"
-                    if message.sender:
-                        if hasattr(message.sender, 'username'):
-                            sender_name = f"@{message.sender.username}" if message.sender.username else f"ID:{message.sender.id}"
-                        else:
-                            sender_name = f"ID:{message.sender.id}"
-                    
+                    sender = message.sender
+                    if sender is None:
+                        sender_name = "Unknown"
+                    else:
+                        uname = getattr(sender, 'username', None)
+                        sender_name = f"@{uname}" if uname else f"ID:{sender.id}"
+
                     # Check if it would be filtered
-                    from services.analytics.telegram_monitor import TelegramPropertyMonitor
-                    monitor = TelegramPropertyMonitor(api_id, api_hash, './storage')
-                    is_owner = monitor.is_likely_owner_message(message.text)
-                    
+                    is_owner = monitor.is_likely_owner_message(text, text_lower)
+
                     # Display message info
-                    date_str = message.date.strftime('%Y-%m-%d %H:%M') if message.date else 'Unknown'
-                    text_preview = message.text[:100].replace('\n', ' ')
-                    if len(message.text) > 100:
+                    date_str = _fmt_minute(message.date) if message.date else 'Unknown'
+                    text_preview = text[:100].translate(_PREVIEW_TBL)
+                    if len(text) > 100:
                         text_preview += "..."
-                    
+
                     status = "🏢 OWNER/LISTING" if is_owner else "👤 MEMBER"
-                    
+
                     if is_owner:
                         owner_count += 1
                     else:
                         member_count += 1
-                    
-                    print(f"\nMessage #{count}:")
-                    print(f"  Status: {status}")
-                    print(f"  From: {sender_name}")
-                    print(f"  Date: {date_str}")
-                    print(f"  Length: {len(message.text)} chars")
-                    print(f"  Text: {text_preview}")
-                    
+
+                    lines.append(f"\nMessage #{count}:")
+                    lines.append(f"  Status: {status}")
+                    lines.append(f"  From: {sender_name}")
+                    lines.append(f"  Date: {date_str}")
+                    lines.append(f"  Length: {len(message.text)} chars")
+                    lines.append(f"  Text: {text_preview}")
+
                     # Show why it was filtered (if owner)
                     if is_owner:
-                        text_lower = message.text.lower()
                         reasons = []
-                        
+
+                        # Single scan collects every category at once
+                        has_link = has_promo = False
+                        listing_hits = set()
+                        for match in _REASON_RE.finditer(text_lower):
+                            group = match.lastgroup
+                            if group == 'link':
+                                has_link = True
+                            elif group == 'promo':
+                                has_promo = True
+                            else:
+                                listing_hits.add(match.group())
+
                         if '#' in message.text:
                             reasons.append("Has hashtags")
-                        if any(link in text_lower for link in ['http', 'youtube', 'vk.com']):
+                        if has_link:
                             reasons.append("Contains links")
-                        if any(fmt in message.text for fmt in ['**', '✅', '➡️', '✔️']):
+                        if any(fmt in message.text for fmt in _FORMAT_TOKENS):
                             reasons.append("Has formatting")
-                        if any(word in text_lower for word in ['подписывайтесь', 'subscribe', 'смотрим']):
+                        if has_promo:
                             reasons.append("Promotional language")
-                        if len(message.text) > 200:
-                            listing_words = ['for sale', 'for rent', 'price:', 'bedroom', 'bathroom']
-                            if sum(1 for word in listing_words if word in text_lower) >= 2:
-                                reasons.append("Multiple listing indicators")
-                        
+                        if len(message.text) > 200 and len(listing_hits) >= 2:
+                            reasons.append("Multiple listing indicators")
+
                         if reasons:
-                            print(f"  ❌ Filtered because: {', '.join(reasons)}")
-            
-            print(f"\n📊 SUMMARY for {channel}:")
-            print(f"  Total messages checked: {count}")
-            print(f"  🏢 Owner/Listing messages: {owner_count}")
-            print(f"  👤 Member messages: {member_count}")
-            
+                            lines.append(f"  ❌ Filtered because: {', '.join(reasons)}")
+
+            lines.append(f"\n📊 SUMMARY for {channel}:")
+            lines.append(f"  Total messages checked: {count}")
+            lines.append(f"  🏢 Owner/Listing messages: {owner_count}")
+            lines.append(f"  👤 Member messages: {member_count}")
+
             if member_count == 0:
-                print(f"\n💡 No member messages found. Possible reasons:")
-                print(f"  • All recent messages are from channel owner")
-                print(f"  • Channel has no recent member activity")
-                print(f"  • Filter might be too aggressive")
-            
+                lines.append(f"\n💡 No member messages found. Possible reasons:")
+                lines.append(f"  • All recent messages are from channel owner")
+                lines.append(f"  • Channel has no recent member activity")
+                lines.append(f"  • Filter might be too aggressive")
+
         except Exception as e:
-            print(f"❌ Error accessing {channel}: {e}")
-    
-    await client.disconnect()
+            lines.append(f"❌ Error accessing {channel}: {e}")
+
+        return lines
+
+    # Fetch the channels concurrently (MTProto multiplexes the requests),
+    # then emit each buffer in order — one write per channel instead of a
+    # locked, possibly flushed print per line
+    for lines in await asyncio.gather(*(debug_one(c) for c in channels)):
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    await manager.disconnect()
 
 if __name__ == "__main__":
     from dotenv import load_dotenv
@@ -5,6 +5,7 @@ Get Channel ID for OneMinuta Property Channel
 
 import os
 import asyncio
+import sys
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,8 +13,11 @@ load_dotenv()
 try:
     from telegram import Bot
 except ImportError:
-    os.system("pip install python-telegram-bot")
-    from telegram import Bot
+    # Installing is a deployment-time concern; don't fork pip from the
+    # import path
+    sys.exit("python-telegram-bot not installed — run: pip install python-telegram-bot")
+
+_CHANNEL_TYPES = frozenset(('channel', 'supergroup'))
 
 async def get_channel_info():
     bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -30,17 +34,19 @@ async def get_channel_info():
         # Get recent updates to find channel messages
         updates = await bot.get_updates(limit=100)
         
-        channels_found = set()
-        
+        # Dict keyed by chat id deduplicates without building a tuple per
+        # update
+        channels_found = {}
+
         for update in updates:
             if update.message and update.message.chat:
                 chat = update.message.chat
-                if chat.type in ['channel', 'supergroup']:
-                    channels_found.add((chat.id, chat.title or chat.username or "Unknown"))
-        
+                if chat.type in _CHANNEL_TYPES:
+                    channels_found[chat.id] = chat.title or chat.username or "Unknown"
+
         if channels_found:
             print("📢 Found these channels/groups:")
-            for channel_id, channel_name in channels_found:
+            for channel_id, channel_name in channels_found.items():
                 print(f"   ID: {channel_id}")
                 print(f"   Name: {channel_name}")
                 print("-" * 30)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Simple Telegram Bot for OneMinuta Chatbot Testing
-Uses python-telegram-bot library for easier bot implementation
+Runs over Telethon's MTProto connection instead of Bot API HTTP long-polling
 """
 
 import asyncio
@@ -18,14 +18,7 @@ load_dotenv()
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-try:
-    from telegram import Update
-    from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
-except ImportError:
-    print("❌ python-telegram-bot not installed. Installing now...")
-    os.system("pip install python-telegram-bot")
-    from telegram import Update
-    from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+from telethon import TelegramClient, events
 
 from services.chatbot.chatbot_manager import OneMinutaChatbotManager
 
@@ -37,29 +30,49 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class OneMinutaTelegramBot:
-    def __init__(self, token: str, openai_api_key: str, storage_path: str = "./storage"):
+    def __init__(self, token: str, openai_api_key: str, storage_path: str = "./storage",
+                 api_id: int = None, api_hash: str = None):
         self.token = token
         self.storage_path = storage_path
-        
+
         # Initialize OneMinuta chatbot
         self.chatbot = OneMinutaChatbotManager(storage_path, openai_api_key)
-        
-        # Initialize Telegram bot
-        self.application = Application.builder().token(token).build()
+
+        # MTProto client: updates arrive over one persistent DC connection
+        # instead of repeated getUpdates long-polls through the Bot API.
+        # The bot gets its own session file — the oneminuta_prod session
+        # holds a user login and can't also carry a bot authorization.
+        self.api_id = api_id or int(os.getenv('TELEGRAM_API_ID', 0))
+        self.api_hash = api_hash or os.getenv('TELEGRAM_API_HASH', '')
+        session_path = Path('sessions') / 'oneminuta_bot'
+        session_path.parent.mkdir(exist_ok=True)
+        self.client = TelegramClient(str(session_path), self.api_id, self.api_hash)
         self.setup_handlers()
-    
+
     def setup_handlers(self):
         """Setup command and message handlers"""
         # Command handlers
-        self.application.add_handler(CommandHandler("start", self.start_command))
-        self.application.add_handler(CommandHandler("reset", self.reset_command))
-        self.application.add_handler(CommandHandler("stats", self.stats_command))
-        self.application.add_handler(CommandHandler("help", self.help_command))
-        
-        # Message handler for chatbot conversation
-        self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
-    
-    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        self.client.add_event_handler(self.start_command, events.NewMessage(pattern=r'^/start\b'))
+        self.client.add_event_handler(self.reset_command, events.NewMessage(pattern=r'^/reset\b'))
+        self.client.add_event_handler(self.stats_command, events.NewMessage(pattern=r'^/stats\b'))
+        self.client.add_event_handler(self.help_command, events.NewMessage(pattern=r'^/help\b'))
+
+        # Catch-all handler for chatbot conversation (skips commands itself)
+        self.client.add_event_handler(self.handle_message, events.NewMessage(incoming=True))
+
+    async def _sender_label(self, event) -> str:
+        """Best-effort display name for logging"""
+        try:
+            sender = await event.get_sender()
+            if sender and sender.username:
+                return sender.username
+            if sender and sender.first_name:
+                return sender.first_name
+        except Exception:
+            pass
+        return str(event.sender_id)
+
+    async def start_command(self, event):
         """Handle /start command"""
         welcome_msg = """🏠 Welcome to OneMinuta Property Chatbot!
 
@@ -77,35 +90,35 @@ You can communicate in English or Russian. Try saying:
 • "I need a 2-bedroom apartment under 30,000 THB"
 
 Let's find your dream property! 🌴"""
-        
-        await update.message.reply_text(welcome_msg)
-        
+
+        await event.reply(welcome_msg)
+
         # Reset conversation for clean start
-        user_id = str(update.effective_user.id)
+        user_id = str(event.sender_id)
         await self.chatbot.reset_conversation(user_id)
-        
-        logger.info(f"User {update.effective_user.username or user_id} started conversation")
-    
-    async def reset_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+        logger.info(f"User {await self._sender_label(event)} started conversation")
+
+    async def reset_command(self, event):
         """Handle /reset command"""
-        user_id = str(update.effective_user.id)
+        user_id = str(event.sender_id)
         success = await self.chatbot.reset_conversation(user_id)
-        
+
         if success:
-            await update.message.reply_text("🔄 Your conversation has been reset. You can start fresh!")
+            await event.reply("🔄 Your conversation has been reset. You can start fresh!")
         else:
-            await update.message.reply_text("❌ Failed to reset conversation. Please try again.")
-        
-        logger.info(f"User {update.effective_user.username or user_id} reset conversation")
-    
-    async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+            await event.reply("❌ Failed to reset conversation. Please try again.")
+
+        logger.info(f"User {await self._sender_label(event)} reset conversation")
+
+    async def stats_command(self, event):
         """Handle /stats command"""
-        user_id = str(update.effective_user.id)
+        user_id = str(event.sender_id)
         stats = await self.chatbot.get_user_stats(user_id)
-        
+
         if stats:
             stats_msg = f"""📊 Your OneMinuta Statistics:
-            
+
 🗣️ Messages: {stats.get('message_count', 0)}
 📍 Current stage: {stats.get('current_stage', 'Not started')}
 ⏰ Session duration: {stats.get('session_duration', 'N/A')}
@@ -113,10 +126,10 @@ Let's find your dream property! 🌴"""
 📅 Last activity: {stats.get('last_activity', 'N/A')}"""
         else:
             stats_msg = "No conversation data found. Send a message to start chatting!"
-        
-        await update.message.reply_text(stats_msg)
-    
-    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+        await event.reply(stats_msg)
+
+    async def help_command(self, event):
         """Handle /help command"""
         help_msg = """🤖 OneMinuta Chatbot Help
 
@@ -133,7 +146,7 @@ Let's find your dream property! 🌴"""
 
 **Commands:**
 • /start - Begin conversation
-• /reset - Clear conversation history  
+• /reset - Clear conversation history
 • /stats - View your statistics
 • /help - Show this message
 
@@ -143,84 +156,92 @@ Let's find your dream property! 🌴"""
 • "I want to invest in Thai real estate"
 
 Start chatting to find your perfect property! 🏡"""
-        
-        await update.message.reply_text(help_msg)
-    
-    async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+        await event.reply(help_msg)
+
+    async def _send_typing(self, chat_id):
+        """Best-effort typing indicator; failures never affect the reply"""
+        try:
+            await self.client.action(chat_id, 'typing')
+        except Exception:
+            pass
+
+    async def handle_message(self, event):
         """Handle regular text messages"""
-        user_id = str(update.effective_user.id)
-        user_message = update.message.text
-        username = update.effective_user.username or update.effective_user.first_name or user_id
-        
+        user_message = event.raw_text
+        if not user_message or user_message.startswith('/'):
+            return  # Commands are handled by their own handlers
+
+        user_id = str(event.sender_id)
+        username = await self._sender_label(event)
+
         logger.info(f"Processing message from {username}: {user_message[:50]}...")
-        
+
         try:
-            # Send typing action
-            await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing")
-            
+            # Fire the typing indicator concurrently with the chatbot call —
+            # it's best-effort and shouldn't delay the LLM round-trip
+            typing_task = asyncio.create_task(self._send_typing(event.chat_id))
+
             # Process message through chatbot
             result = await self.chatbot.process_message(user_id, user_message)
-            
+            await typing_task
+
             # Send response
             if result and result.get('reply'):
-                await update.message.reply_text(result['reply'])
-                
+                await event.reply(result['reply'])
+
                 # Log successful interaction
                 logger.info(f"Response sent to {username}: {result['reply'][:50]}...")
-                
+
                 # If conversation is complete, show summary
                 if result.get('session_complete'):
                     completion_msg = """✅ Property search completed!
-                    
+
 Thank you for using OneMinuta. Your requirements have been collected and our team will be in touch soon.
 
 Use /start to begin a new search or /stats to view your session details."""
-                    await update.message.reply_text(completion_msg)
+                    await event.reply(completion_msg)
             else:
                 # Fallback response
-                await update.message.reply_text(
+                await event.reply(
                     "I apologize, but I couldn't process your request right now. Please try again or use /reset to start over."
                 )
-                
+
         except Exception as e:
             logger.error(f"Error processing message from {username}: {e}")
-            await update.message.reply_text(
+            await event.reply(
                 "Sorry, I encountered an error processing your message. Please try again later or contact support."
             )
-    
+
     async def start_bot(self):
         """Start the bot"""
         logger.info("🤖 Starting OneMinuta Telegram Bot...")
         logger.info(f"Bot token: {self.token[:10]}...")
         logger.info(f"Storage path: {self.storage_path}")
-        
-        # Start polling
-        await self.application.initialize()
-        await self.application.start()
-        await self.application.updater.start_polling()
-        
+
+        # Log in as bot over MTProto; the session file makes this a no-op
+        # on subsequent runs
+        await self.client.start(bot_token=self.token)
+
         logger.info("✅ Bot started successfully! Send /start to @OneMinutaBot to test")
         logger.info("Press Ctrl+C to stop the bot")
-        
-        # Keep running until interrupted
+
+        # Block on a shutdown event instead of a 1-second wakeup loop: the
+        # process stays fully idle until a signal actually arrives
         import signal
-        
-        def signal_handler(sig, frame):
-            logger.info("Received interrupt signal, stopping bot...")
-            
-        signal.signal(signal.SIGINT, signal_handler)
-        
-        try:
-            # Keep the application running
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
-            pass
-    
+
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGINT, stop_event.set)
+        loop.add_signal_handler(signal.SIGTERM, stop_event.set)
+
+        await stop_event.wait()
+        logger.info("Received interrupt signal, stopping bot...")
+
     async def stop_bot(self):
         """Stop the bot"""
         logger.info("Stopping bot...")
-        await self.application.stop()
+        await self.client.disconnect()
 
 async def main():
     """Main function"""
@@ -228,29 +249,42 @@ async def main():
     bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
     openai_key = os.getenv('OPENAI_API_KEY')
     storage_path = os.getenv('STORAGE_PATH', './storage')
-    
+
     if not bot_token:
         print("❌ TELEGRAM_BOT_TOKEN not found in .env file")
         return
-    
+
     if not openai_key:
         print("❌ OPENAI_API_KEY not found in .env file")
         return
-    
+
+    if not os.getenv('TELEGRAM_API_ID') or not os.getenv('TELEGRAM_API_HASH'):
+        print("❌ TELEGRAM_API_ID / TELEGRAM_API_HASH not found in .env file")
+        return
+
     print(f"🤖 OneMinuta Telegram Bot Starting...")
     print(f"📁 Storage: {storage_path}")
     print(f"🔑 OpenAI Model: {os.getenv('LLM_MODEL', 'gpt-4o-mini')}")
     print("=" * 50)
-    
+
     # Create and start bot
     bot = OneMinutaTelegramBot(bot_token, openai_key, storage_path)
-    
+
     try:
         await bot.start_bot()
     except KeyboardInterrupt:
         print("\n🛑 Stopping bot...")
+    finally:
         await bot.stop_bot()
         print("✅ Bot stopped successfully")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        # uvloop roughly halves asyncio task-switch overhead; optional so
+        # dev installs without it still run
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+    asyncio.run(main())
@@ -5,10 +5,14 @@ Supports auto-greeting new channel members and partner channel integration
 """
 
 import asyncio
+import html
 import logging
 import os
+import re
 import sys
+import time
 from pathlib import Path
+from types import SimpleNamespace
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -19,29 +23,29 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 try:
-    from telegram import Update, ChatMember
+    from telegram import Update
     from telegram.ext import (
-        Application, 
-        CommandHandler, 
-        MessageHandler, 
+        Application,
+        CommandHandler,
+        MessageHandler,
         ChatMemberHandler,
-        filters, 
+        filters,
         ContextTypes
     )
-    from telegram.constants import ChatMemberStatus
+    from telegram.constants import ChatMemberStatus, ParseMode
 except ImportError:
-    print("❌ python-telegram-bot not installed. Installing now...")
-    os.system("pip install python-telegram-bot")
-    from telegram import Update, ChatMember
-    from telegram.ext import (
-        Application, 
-        CommandHandler, 
-        MessageHandler, 
-        ChatMemberHandler,
-        filters, 
-        ContextTypes
-    )
-    from telegram.constants import ChatMemberStatus
+    # Installing is a deployment-time concern; don't fork pip from the
+    # import path
+    sys.exit("python-telegram-bot not installed — run: pip install python-telegram-bot")
+
+try:
+    # Optional: shares caches/partner config across worker replicas when
+    # REDIS_URL is configured
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+import orjson
 
 from services.chatbot.chatbot_manager import OneMinutaChatbotManager
 from services.analytics.channel_analytics import ChannelAnalytics, MemberEventType
@@ -53,6 +57,162 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Only the update classes the handlers actually consume — skipping the
+# rest cuts getUpdates payloads
+ALLOWED_UPDATES = ["message", "chat_member", "callback_query"]
+
+# Status transitions checked on every member update
+_OUTSIDE_STATES = frozenset({ChatMemberStatus.LEFT, ChatMemberStatus.BANNED})
+_INSIDE_STATES = frozenset({ChatMemberStatus.MEMBER, ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER})
+_ACTIVE_STATES = frozenset({ChatMemberStatus.MEMBER, ChatMemberStatus.ADMINISTRATOR})
+
+# Quiet window before syncing the real member count; a join/leave burst
+# collapses into one getChatMemberCount call per channel
+SYNC_DEBOUNCE_SECONDS = 2.0
+
+# Outbound DM pacing: stay just under Telegram's 30 msg/s global cap,
+# and at most one message per second to any single chat
+SEND_MIN_INTERVAL = 1 / 28
+PER_CHAT_MIN_INTERVAL = 1.0
+
+# Generated welcome templates are reused for a day before asking the LLM
+# again
+WELCOME_TEMPLATE_TTL = 86400
+
+# Partner channels live in a config file that is hot-reloaded on mtime
+# change, so onboarding a channel doesn't need a redeploy
+PARTNER_CONFIG_PATH = project_root / 'config' / 'partner_channels.json'
+PARTNER_CONFIG_POLL_SECONDS = 30
+
+# Greetings/acknowledgements answered by the rule-based fast path; an LLM
+# round-trip for "ok" adds seconds of latency and costs tokens for nothing.
+# Only exact matches (or emoji-only input) qualify — short answers like
+# "2" or "no" are real conversation turns and must reach the chatbot
+_ACK_SET = frozenset({
+    "hi", "hello", "hey", "ok", "okay", "thanks", "thank you", "спасибо",
+    "привет", "👍", "👋", "🙏", "🏡",
+})
+_ACK_REPLY = "👋 Happy to help! Tell me what property you're looking for — location, budget, bedrooms — and I'll get searching. 🏡"
+
+
+def _is_emoji_only(text):
+    """True when the text carries no letters or digits in any script —
+    emoji, symbols and punctuation only"""
+    return not any(ch.isalnum() for ch in text)
+
+# Formatted /analytics blocks are reused briefly so repeated invocations
+# don't re-query the analytics store
+METRICS_CACHE_TTL = 30
+
+# Static reply bodies rendered once at import instead of rebuilt on every
+# command invocation.  The Markdown-ish sources below are converted to
+# HTML a single time by _md_to_html so sends carry parse_mode=HTML with
+# no per-send escaping or Markdown parsing — previously the asterisks
+# reached users literally because no parse_mode was passed at all.
+
+def _md_to_html(text):
+    """Render the ``**bold**`` / ``` `code` ``` markup of the constants
+    below to Telegram HTML, escaping everything else"""
+    text = html.escape(text, quote=False)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', text)
+    return re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
+
+START_MSG_BODY = """🏠 Welcome to OneMinuta!
+
+I'm your AI property assistant for Thailand. I help you find perfect properties quickly and easily.
+
+🎯 **What I can do:**
+• Find condos, villas, apartments for rent or sale
+• Search by location, budget, bedrooms
+• Support English and Russian
+• Connect you with verified agents
+
+🚀 **Quick start:**
+Just tell me what you're looking for!
+
+**Examples:**
+• "I need a 2-bedroom condo in Phuket under 30k"
+• "Looking for villa in Rawai for investment"
+• "Ищу квартиру в Бангкоке для аренды"
+
+**Commands:**
+• /reset - Start over
+• /stats - Your search history
+• /channels - Partner channels
+• /join - Test channel welcome (for demo)
+• /help - More info
+
+What can I help you find today? 🌴"""
+
+CHANNELS_MSG = """🤝 **OneMinuta Partner Channels**
+
+Find us in these verified property channels:
+
+🏖️ **Phuket Properties** - @phuket_properties
+🏙️ **Bangkok Condos** - @bangkok_condos  
+🌴 **Koh Samui Villas** - @samui_villas
+🏡 **Thailand Property Hub** - @thailand_property
+
+💡 **Join these channels for:**
+• Latest property listings
+• Market insights
+• Investment opportunities
+• Direct agent contacts
+
+When you join any partner channel, I'll automatically help you find what you're looking for! 🎯"""
+
+HELP_MSG = """🤖 **OneMinuta Help Center**
+
+**🎯 How to search:**
+Just tell me what you want in natural language!
+
+**📝 Examples:**
+• "2-bedroom condo in Phuket under 25k"
+• "Villa with pool in Rawai for sale"
+• "Cheap apartment near BTS in Bangkok"
+• "Investment property in Koh Samui"
+
+**🌐 Languages:** English, русский
+
+**📍 Locations:** Phuket, Bangkok, Pattaya, Koh Samui, Hua Hin, Chiang Mai
+
+**🏡 Property Types:** Condos, Villas, Apartments, Houses, Land
+
+**💰 Services:** Rent, Sale, Investment advice
+
+**🚀 Commands:**
+• `/start` - Begin new search
+• `/reset` - Clear history  
+• `/stats` - View your activity
+• `/analytics` - Channel growth analytics
+• `/channels` - Partner channels
+• `/join` - Test channel join experience
+• `/help` - This message
+
+**Need human help?** I'll connect you with our verified agents! 👥"""
+
+COMPLETION_MSG = """✅ **Search Complete!**
+                    
+🎯 I've collected your requirements. Our verified agents will contact you within 24 hours with matching properties.
+
+**What's next:**
+📞 Agent will call/message you
+📧 Receive property shortlist  
+🏠 Schedule viewings
+💬 Continue chatting anytime!
+
+**Quick actions:**
+• /start - New search
+• /stats - View this search
+• /channels - Join partner channels
+
+Thank you for using OneMinuta! 🌴"""
+
+START_MSG_BODY = _md_to_html(START_MSG_BODY)
+CHANNELS_MSG = _md_to_html(CHANNELS_MSG)
+HELP_MSG = _md_to_html(HELP_MSG)
+COMPLETION_MSG = _md_to_html(COMPLETION_MSG)
+
 class OneMinutaChannelBot:
     def __init__(self, token: str, openai_api_key: str, storage_path: str = "./storage"):
         self.token = token
@@ -64,24 +224,90 @@ class OneMinutaChannelBot:
         # Initialize Channel Analytics
         self.analytics = ChannelAnalytics(storage_path)
         
-        # Initialize Telegram bot
-        self.application = Application.builder().token(token).build()
+        # Initialize Telegram bot. One enlarged keep-alive pool serves all
+        # concurrent handler sends — the default pool is 1 connection, so
+        # parallel replies either queue on it or pay a fresh TLS handshake
+        self.application = (
+            Application.builder()
+            .token(token)
+            .connection_pool_size(50)
+            .pool_timeout(10.0)
+            .build()
+        )
         self.setup_handlers()
         
         # Partner channels (to be configured)
         self.partner_channels = self.load_partner_channels()
+        # Frozen id view for the hot membership test in handle_member_update
+        self._partner_ids = frozenset(self.partner_channels)
+
+        # Debounce timers for member-count syncs, keyed by chat id
+        self._pending_sync = {}
+
+        # Strong refs to fire-and-forget analytics tasks so they aren't
+        # garbage-collected mid-flight
+        self._bg_tasks = set()
+
+        # Bounded outbound queue drained by a rate-limited sender task,
+        # so handlers enqueue DMs instead of blocking on the send
+        self.send_queue = asyncio.Queue(maxsize=10000)
+        self._sender_task = None
+        self._config_watch_task = None
+        self._stop_event = None
+
+        # Bot identity resolved once at startup (see start_bot) so the
+        # per-update self-check never touches bot.get_me()
+        self._self_id = None
+        self._bot_username = None
+
+        # AI welcome templates keyed by channel template name:
+        # (template_text, generated_at). When Redis is configured the
+        # templates live there instead, shared across workers
+        self._welcome_cache = {}
+        # Single-flight guard: user id -> future resolved when that user's
+        # welcome DM has been generated and queued
+        self._inflight_welcomes = {}
+        redis_url = os.getenv('REDIS_URL')
+        self.redis = aioredis.from_url(redis_url) if (redis_url and aioredis) else None
     
     def load_partner_channels(self):
-        """Load partner channel configurations"""
-        # This can be loaded from config file or database
-        return {
-            # Channel ID: Channel Info
-            # -1001234567890: {
-            #     "name": "Phuket Properties",
-            #     "welcome_template": "phuket_welcome",
-            #     "auto_greet": True
-            # }
-        }
+        """Load partner channel configurations from config/partner_channels.json
+
+        Shape: {"-1001234567890": {"name": ..., "welcome_template": ...,
+        "auto_greet": true}, ...}
+        """
+        try:
+            self._config_mtime = PARTNER_CONFIG_PATH.stat().st_mtime
+        except OSError:
+            self._config_mtime = None
+            return {}
+        try:
+            with open(PARTNER_CONFIG_PATH, 'rb') as f:
+                raw = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.error(f"Failed to load partner channel config: {e}")
+            return {}
+        # JSON keys are strings; channel ids are ints everywhere else
+        return {int(channel_id): info for channel_id, info in raw.items()}
+
+    async def _watch_partner_config(self):
+        """Reload the partner config when its mtime changes, so channels
+        can be onboarded without a restart (which would also drop the
+        in-process caches)"""
+        while True:
+            await asyncio.sleep(PARTNER_CONFIG_POLL_SECONDS)
+            try:
+                mtime = PARTNER_CONFIG_PATH.stat().st_mtime
+            except OSError:
+                continue
+            if mtime == self._config_mtime:
+                continue
+            channels = self.load_partner_channels()
+            # Atomic swap: handlers see either the old dict or the new one
+            self.partner_channels = channels
+            self._partner_ids = frozenset(channels)
+            await self._load_shared_partner_channels()
+            logger.info(f"Partner channel config reloaded: {len(self.partner_channels)} channels")
     
     def setup_handlers(self):
         """Setup command and message handlers"""
@@ -96,94 +322,145 @@ class OneMinutaChannelBot:
         
         # Channel member updates (for auto-greeting new members)
         self.application.add_handler(ChatMemberHandler(self.handle_member_update, ChatMemberHandler.CHAT_MEMBER))
+
+        # One central error handler instead of a try/except copy in every
+        # handler — single place for logging (and future metrics/Sentry)
+        self.application.add_error_handler(self._on_error)
         
         # Message handler for chatbot conversation
         self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
     
+    def _track_in_background(self, coro):
+        """Run an analytics write without blocking the handler"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._on_bg_task_done)
+
+    def _on_bg_task_done(self, task):
+        self._bg_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Background analytics task failed: {task.exception()}")
+
+    def _schedule_sync(self, chat_id: int, bot):
+        """Debounced member-count sync: (re)arm a short timer so a burst of
+        member events issues one API call instead of one per event"""
+        pending = self._pending_sync.pop(chat_id, None)
+        if pending:
+            pending.cancel()
+
+        def _run():
+            self._pending_sync.pop(chat_id, None)
+            self._track_in_background(self.analytics.sync_real_member_count(str(chat_id), bot))
+
+        loop = asyncio.get_running_loop()
+        self._pending_sync[chat_id] = loop.call_later(SYNC_DEBOUNCE_SECONDS, _run)
+
     async def handle_member_update(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle new members joining partner channels"""
-        try:
-            chat_member_update = update.chat_member
-            chat = chat_member_update.chat
-            user = chat_member_update.new_chat_member.user
-            old_status = chat_member_update.old_chat_member.status
-            new_status = chat_member_update.new_chat_member.status
-            
-            # Check if someone joined a partner channel
-            if (chat.id in self.partner_channels and 
-                old_status in [ChatMemberStatus.LEFT, ChatMemberStatus.BANNED] and
-                new_status in [ChatMemberStatus.MEMBER, ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER]):
-                
-                # Don't greet bots or the bot itself
-                if user.is_bot or user.id == context.bot.id:
-                    return
-                
-                channel_info = self.partner_channels[chat.id]
-                
-                # Track new member join in analytics
-                await self.analytics.track_member_event(
-                    channel_id=str(chat.id),
-                    channel_name=chat.title or channel_info.get("name", "Unknown"),
-                    user_id=str(user.id),
-                    event_type=MemberEventType.JOINED,
-                    username=user.username,
-                    metadata={
-                        "first_name": user.first_name,
-                        "last_name": user.last_name,
-                        "is_premium": getattr(user, 'is_premium', False)
-                    }
-                )
-                
-                # Sync real member count after tracking event
-                await self.analytics.sync_real_member_count(str(chat.id), context.bot)
-                logger.info(f"Tracked new member join: {user.username or user.id} in {chat.title}")
-                
-                if channel_info.get("auto_greet", True):
-                    await self.send_welcome_dm(user, chat, channel_info)
-            
-            # Track member leaving
-            elif (chat.id in self.partner_channels and
-                  old_status in [ChatMemberStatus.MEMBER, ChatMemberStatus.ADMINISTRATOR] and
-                  new_status in [ChatMemberStatus.LEFT, ChatMemberStatus.BANNED]):
-                
-                await self.analytics.track_member_event(
-                    channel_id=str(chat.id),
-                    channel_name=chat.title or "Unknown",
-                    user_id=str(user.id),
-                    event_type=MemberEventType.LEFT if new_status == ChatMemberStatus.LEFT else MemberEventType.BANNED,
-                    username=user.username
-                )
-                
-                # Sync real member count after tracking event
-                await self.analytics.sync_real_member_count(str(chat.id), context.bot)
-                logger.info(f"Tracked member leave: {user.username or user.id} from {chat.title}")
-                    
-        except Exception as e:
-            logger.error(f"Error handling member update: {e}")
+        # Bail out before any further attribute walking for the chats we
+        # don't track — this runs for every member update the bot sees
+        chat_member_update = update.chat_member
+        if chat_member_update is None or chat_member_update.chat.id not in self._partner_ids:
+            return
+
+        chat = chat_member_update.chat
+        user = chat_member_update.new_chat_member.user
+        old_status = chat_member_update.old_chat_member.status
+        new_status = chat_member_update.new_chat_member.status
+
+        # Check if someone joined a partner channel
+        if old_status in _OUTSIDE_STATES and new_status in _INSIDE_STATES:
+
+            # Don't greet bots or the bot itself
+            if user.is_bot or user.id == self._self_id:
+                return
+
+            channel_info = self.partner_channels[chat.id]
+
+            # Track new member join in analytics (fire-and-forget —
+            # the greeting shouldn't wait on the analytics store)
+            self._track_in_background(self.analytics.track_member_event(
+                channel_id=str(chat.id),
+                channel_name=chat.title or channel_info.get("name", "Unknown"),
+                user_id=str(user.id),
+                event_type=MemberEventType.JOINED,
+                username=user.username,
+                metadata={
+                    "first_name": user.first_name,
+                    "last_name": user.last_name,
+                    "is_premium": getattr(user, 'is_premium', False)
+                }
+            ))
+
+            # Sync real member count once the burst settles
+            self._schedule_sync(chat.id, context.bot)
+            logger.info(f"Tracked new member join: {user.username or user.id} in {chat.title}")
+
+            if channel_info.get("auto_greet", True):
+                await self.send_welcome_dm(user, chat, channel_info)
+
+        # Track member leaving
+        elif old_status in _ACTIVE_STATES and new_status in _OUTSIDE_STATES:
+
+            self._track_in_background(self.analytics.track_member_event(
+                channel_id=str(chat.id),
+                channel_name=chat.title or "Unknown",
+                user_id=str(user.id),
+                event_type=MemberEventType.LEFT if new_status == ChatMemberStatus.LEFT else MemberEventType.BANNED,
+                username=user.username
+            ))
+
+            # Sync real member count once the burst settles
+            self._schedule_sync(chat.id, context.bot)
+            logger.info(f"Tracked member leave: {user.username or user.id} from {chat.title}")
     
     async def send_welcome_dm(self, user, channel, channel_info):
         """Send personalized welcome DM to new channel member"""
+        # Single-flight per user: if a welcome is already being generated
+        # (double join within seconds, or Telegram redelivering an update),
+        # wait for it and skip the duplicate DM entirely
+        inflight = self._inflight_welcomes.get(user.id)
+        if inflight is not None:
+            await inflight
+            return
+
+        done = asyncio.get_running_loop().create_future()
+        self._inflight_welcomes[user.id] = done
+        try:
+            await self._generate_and_queue_welcome(user, channel, channel_info)
+        finally:
+            done.set_result(None)
+            self._inflight_welcomes.pop(user.id, None)
+
+    async def _generate_and_queue_welcome(self, user, channel, channel_info):
         try:
             # Get user's first name or username
             user_name = user.first_name or user.username or "there"
             channel_name = channel_info.get("name", channel.title)
-            
-            # Create personalized welcome message using AI
-            welcome_context = f"""
+
+            # The AI welcome only varies by channel and user name — generate
+            # a {USER_NAME} template once per channel per day and substitute
+            # the name per join, instead of an LLM round-trip per member
+            cache_key = channel_info.get("welcome_template") or channel_name
+            template = await self._get_welcome_template(cache_key)
+            if template is None:
+                welcome_context = f"""
             User joined channel: {channel_name}
-            User name: {user_name}
+            User name: {{USER_NAME}}
             Create a warm, professional welcome message that:
-            1. Greets them by name
+            1. Greets them by name, using the literal placeholder {{USER_NAME}} wherever the name belongs
             2. Welcomes them to the channel
             3. Introduces OneMinuta as property search assistant
             4. Asks what they're looking for (villa, condo, apartment)
             5. Keep it brief and friendly
             6. End with a simple question to engage them
             """
-            
-            # Generate AI welcome message
-            ai_welcome = await self.chatbot.generate_welcome_message(user.id, welcome_context)
-            
+                template = await self.chatbot.generate_welcome_message(user.id, welcome_context)
+                if template:
+                    await self._store_welcome_template(cache_key, template)
+
+            ai_welcome = template.replace("{USER_NAME}", user_name) if template else None
+
             if not ai_welcome:
                 # Fallback welcome message
                 ai_welcome = f"""Hi {user_name}! 👋
@@ -194,78 +471,64 @@ I'm OneMinuta - your AI property assistant for Thailand. I help people find perf
 
 What brings you to the property market today? Looking for something specific? 🏡"""
 
-            # Send DM to user
-            await self.application.bot.send_message(
-                chat_id=user.id,
-                text=ai_welcome
-            )
-            
-            logger.info(f"Sent welcome DM to {user_name} ({user.id}) from channel {channel_name}")
-            
+            # Hand the DM to the rate-limited sender; the handler returns
+            # immediately instead of blocking on the Telegram round-trip
+            try:
+                self.send_queue.put_nowait((user.id, ai_welcome))
+            except asyncio.QueueFull:
+                logger.warning(f"Send queue full, dropping welcome DM for {user.id}")
+                return
+
+            logger.info(f"Queued welcome DM to {user_name} ({user.id}) from channel {channel_name}")
+
         except Exception as e:
             logger.warning(f"Could not send welcome DM to {user.id}: {e}")
             # This is normal - user might not have started the bot yet
     
+    async def _get_welcome_template(self, cache_key: str):
+        """Look up a cached welcome template (Redis when configured,
+        in-process dict otherwise)"""
+        if self.redis is not None:
+            try:
+                raw = await self.redis.get(f"welcome:{cache_key}")
+                if raw:
+                    return raw.decode('utf-8')
+            except Exception as e:
+                logger.warning(f"Redis welcome lookup failed: {e}")
+            return None
+
+        cached = self._welcome_cache.get(cache_key)
+        if cached and time.time() - cached[1] < WELCOME_TEMPLATE_TTL:
+            return cached[0]
+        return None
+
+    async def _store_welcome_template(self, cache_key: str, template: str):
+        if self.redis is not None:
+            try:
+                await self.redis.setex(f"welcome:{cache_key}", WELCOME_TEMPLATE_TTL, template)
+                return
+            except Exception as e:
+                logger.warning(f"Redis welcome store failed: {e}")
+        self._welcome_cache[cache_key] = (template, time.time())
+
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
         user = update.effective_user
         user_name = user.first_name or user.username or "there"
         
-        welcome_msg = f"""Hi {user_name}! 🏠 Welcome to OneMinuta!
+        welcome_msg = f"Hi {html.escape(user_name, quote=False)}! " + START_MSG_BODY
 
-I'm your AI property assistant for Thailand. I help you find perfect properties quickly and easily.
+        await update.message.reply_text(welcome_msg, parse_mode=ParseMode.HTML)
 
-🎯 **What I can do:**
-• Find condos, villas, apartments for rent or sale
-• Search by location, budget, bedrooms
-• Support English and Russian
-• Connect you with verified agents
-
-🚀 **Quick start:**
-Just tell me what you're looking for!
-
-**Examples:**
-• "I need a 2-bedroom condo in Phuket under 30k"
-• "Looking for villa in Rawai for investment"
-• "Ищу квартиру в Бангкоке для аренды"
-
-**Commands:**
-• /reset - Start over
-• /stats - Your search history
-• /channels - Partner channels
-• /join - Test channel welcome (for demo)
-• /help - More info
-
-What can I help you find today? 🌴"""
-        
-        await update.message.reply_text(welcome_msg)
-        
         # Reset conversation for clean start
-        user_id = str(update.effective_user.id)
+        user_id = str(user.id)
         await self.chatbot.reset_conversation(user_id)
         
         logger.info(f"User {user.username or user_id} started conversation")
     
     async def channels_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show partner channels information"""
-        channels_msg = """🤝 **OneMinuta Partner Channels**
-
-Find us in these verified property channels:
-
-🏖️ **Phuket Properties** - @phuket_properties
-🏙️ **Bangkok Condos** - @bangkok_condos  
-🌴 **Koh Samui Villas** - @samui_villas
-🏡 **Thailand Property Hub** - @thailand_property
-
-💡 **Join these channels for:**
-• Latest property listings
-• Market insights
-• Investment opportunities
-• Direct agent contacts
-
-When you join any partner channel, I'll automatically help you find what you're looking for! 🎯"""
-
-        await update.message.reply_text(channels_msg)
+        await update.message.reply_text(CHANNELS_MSG, parse_mode=ParseMode.HTML)
     
     async def simulate_join_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Simulate joining OneMinuta Property channel for testing"""
@@ -281,13 +544,8 @@ When you join any partner channel, I'll automatically help you find what you're
             "auto_greet": True
         }
         
-        # Create a mock channel object
-        class MockChannel:
-            def __init__(self):
-                self.id = -1002875386834
-                self.title = "OneMinuta Property Thailand"
-        
-        mock_channel = MockChannel()
+        # Mock channel object — just the two attributes send_welcome_dm reads
+        mock_channel = SimpleNamespace(id=-1002875386834, title="OneMinuta Property Thailand")
         
         # Send the welcome DM (same as real channel join)
         try:
@@ -322,7 +580,8 @@ This usually means:
     
     async def reset_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /reset command"""
-        user_id = str(update.effective_user.id)
+        user = update.effective_user
+        user_id = str(user.id)
         success = await self.chatbot.reset_conversation(user_id)
         
         if success:
@@ -330,7 +589,7 @@ This usually means:
         else:
             await update.message.reply_text("❌ Failed to reset conversation. Please try again.")
         
-        logger.info(f"User {update.effective_user.username or user_id} reset conversation")
+        logger.info(f"User {user.username or user_id} reset conversation")
     
     async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /stats command"""
@@ -358,39 +617,25 @@ This usually means:
         # Check if user is admin (you might want to restrict this)
         # For now, showing basic analytics to everyone
         
-        try:
-            # Get analytics for all partner channels
-            if self.partner_channels:
-                analytics_msg = "📊 **Channel Analytics Dashboard**\n\n"
-                
-                for channel_id, channel_info in self.partner_channels.items():
-                    # First sync with real Telegram member count
-                    await self.analytics.sync_real_member_count(str(channel_id), self.application.bot)
-                    
-                    # Get updated metrics
-                    metrics = await self.analytics.get_channel_metrics(
-                        str(channel_id), 
-                        channel_info.get("name", "Unknown"),
-                        self.application.bot
-                    )
-                    
-                    # Format metrics
-                    growth_emoji = "📈" if metrics.daily_growth_rate > 0 else "📉" if metrics.daily_growth_rate < 0 else "➡️"
-                    health_emoji = "🟢" if metrics.channel_health_score > 70 else "🟡" if metrics.channel_health_score > 40 else "🔴"
-                    
-                    channel_stats = f"""**{channel_info.get('name', 'Channel')}**
-{health_emoji} Health: {metrics.channel_health_score:.0f}/100
-👥 Total Members: {metrics.total_members}
-{growth_emoji} Growth Today: {metrics.new_members_today} joined, {metrics.left_members_today} left
-📊 Growth Rate: {metrics.daily_growth_rate:.1f}% daily, {metrics.weekly_growth_rate:.1f}% weekly
-🔥 Hot Leads: {metrics.hot_leads_generated}
-⚡ Active Members: {metrics.active_members}
-
-"""
-                    analytics_msg += channel_stats
-                
-                # Add summary
-                analytics_msg += """📈 **Growth Tips:**
+        # Get analytics for all partner channels
+        if self.partner_channels:
+            analytics_msg = "📊 **Channel Analytics Dashboard**\n\n"
+
+            # All channels in parallel: wall-clock cost is the slowest
+            # channel's sync+metrics round-trip, not the sum of them
+            blocks = await asyncio.gather(
+                *(self._metrics_block(channel_id, channel_info)
+                  for channel_id, channel_info in self.partner_channels.items()),
+                return_exceptions=True
+            )
+            for block in blocks:
+                if isinstance(block, BaseException):
+                    logger.error(f"Error getting channel metrics: {block}")
+                else:
+                    analytics_msg += block
+
+            # Add summary
+            analytics_msg += """📈 **Growth Tips:**
 • Best time to post: Check peak join hours
 • Improve retention with engaging content
 • Use /analytics regularly to track progress
@@ -398,9 +643,9 @@ This usually means:
 🔗 **Partner Program:**
 Earn commissions on property transactions!
 Contact @oneminuta_partners to learn more."""
-                
-            else:
-                analytics_msg = """📊 **No Analytics Available**
+
+        else:
+            analytics_msg = """📊 **No Analytics Available**
 
 No partner channels configured yet.
 
@@ -408,103 +653,154 @@ No partner channels configured yet.
 1. Add @oneminuta_bot as admin
 2. Contact @oneminuta_partners
 3. Start earning from your community!"""
-            
-            await update.message.reply_text(analytics_msg)
-            
-        except Exception as e:
-            logger.error(f"Error getting analytics: {e}")
-            await update.message.reply_text("❌ Error loading analytics. Please try again later.")
-    
-    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /help command"""
-        help_msg = """🤖 **OneMinuta Help Center**
 
-**🎯 How to search:**
-Just tell me what you want in natural language!
-
-**📝 Examples:**
-• "2-bedroom condo in Phuket under 25k"
-• "Villa with pool in Rawai for sale"
-• "Cheap apartment near BTS in Bangkok"
-• "Investment property in Koh Samui"
-
-**🌐 Languages:** English, русский
-
-**📍 Locations:** Phuket, Bangkok, Pattaya, Koh Samui, Hua Hin, Chiang Mai
-
-**🏡 Property Types:** Condos, Villas, Apartments, Houses, Land
-
-**💰 Services:** Rent, Sale, Investment advice
+        await update.message.reply_text(analytics_msg)
+
+    async def _metrics_block(self, channel_id: int, channel_info: dict) -> str:
+        """Sync and format one channel's analytics block (Redis-cached)"""
+        # Serve a recently formatted block from Redis if present
+        if self.redis is not None:
+            try:
+                raw = await self.redis.get(f"metrics:{channel_id}")
+                if raw:
+                    return raw.decode('utf-8')
+            except Exception as e:
+                logger.warning(f"Redis metrics lookup failed: {e}")
+
+        # First sync with real Telegram member count
+        await self.analytics.sync_real_member_count(str(channel_id), self.application.bot)
+
+        # Get updated metrics
+        metrics = await self.analytics.get_channel_metrics(
+            str(channel_id),
+            channel_info.get("name", "Unknown"),
+            self.application.bot
+        )
+
+        # Format metrics
+        growth_emoji = "📈" if metrics.daily_growth_rate > 0 else "📉" if metrics.daily_growth_rate < 0 else "➡️"
+        health_emoji = "🟢" if metrics.channel_health_score > 70 else "🟡" if metrics.channel_health_score > 40 else "🔴"
+
+        channel_stats = f"""**{channel_info.get('name', 'Channel')}**
+{health_emoji} Health: {metrics.channel_health_score:.0f}/100
+👥 Total Members: {metrics.total_members}
+{growth_emoji} Growth Today: {metrics.new_members_today} joined, {metrics.left_members_today} left
+📊 Growth Rate: {metrics.daily_growth_rate:.1f}% daily, {metrics.weekly_growth_rate:.1f}% weekly
+🔥 Hot Leads: {metrics.hot_leads_generated}
+⚡ Active Members: {metrics.active_members}
 
-**🚀 Commands:**
-• `/start` - Begin new search
-• `/reset` - Clear history  
-• `/stats` - View your activity
-• `/analytics` - Channel growth analytics
-• `/channels` - Partner channels
-• `/join` - Test channel join experience
-• `/help` - This message
+"""
+        if self.redis is not None:
+            try:
+                await self.redis.setex(f"metrics:{channel_id}", METRICS_CACHE_TTL, channel_stats)
+            except Exception as e:
+                logger.warning(f"Redis metrics store failed: {e}")
+        return channel_stats
 
-**Need human help?** I'll connect you with our verified agents! 👥"""
-        
-        await update.message.reply_text(help_msg)
+    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /help command"""
+        await update.message.reply_text(HELP_MSG, parse_mode=ParseMode.HTML)
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle regular text messages"""
-        user_id = str(update.effective_user.id)
+        # effective_user is a property walk — bind it once per update
+        user = update.effective_user
+        user_id = str(user.id)
         user_message = update.message.text
-        username = update.effective_user.username or update.effective_user.first_name or user_id
+        username = user.username or user.first_name or user_id
         
         logger.info(f"Processing message from {username}: {user_message[:50]}...")
-        
-        try:
-            # Send typing action
-            await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing")
-            
-            # Process message through chatbot
-            result = await self.chatbot.process_message(user_id, user_message)
-            
-            # Send response
-            if result and result.get('reply'):
-                await update.message.reply_text(result['reply'])
-                
-                logger.info(f"Response sent to {username}")
-                
-                # If conversation is complete, show next steps
-                if result.get('session_complete'):
-                    completion_msg = """✅ **Search Complete!**
-                    
-🎯 I've collected your requirements. Our verified agents will contact you within 24 hours with matching properties.
 
-**What's next:**
-📞 Agent will call/message you
-📧 Receive property shortlist  
-🏠 Schedule viewings
-💬 Continue chatting anytime!
+        # Rule-based fast path: trivial acknowledgements don't need (or
+        # want) an LLM round-trip — answer canned and return
+        stripped = user_message.strip()
+        if not stripped or stripped.lower() in _ACK_SET or _is_emoji_only(stripped):
+            await update.message.reply_text(_ACK_REPLY)
+            return
 
-**Quick actions:**
-• /start - New search
-• /stats - View this search
-• /channels - Join partner channels
+        # Send typing action
+        await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing")
 
-Thank you for using OneMinuta! 🌴"""
-                    await update.message.reply_text(completion_msg)
-            else:
-                # Fallback response
-                await update.message.reply_text(
-                    "I didn't quite catch that. Could you tell me more about what property you're looking for? 🏡"
-                )
-                
-        except Exception as e:
-            logger.error(f"Error processing message from {username}: {e}")
+        # Process message through chatbot
+        result = await self.chatbot.process_message(user_id, user_message)
+
+        # Send response
+        if result and result.get('reply'):
+            await update.message.reply_text(result['reply'])
+
+            logger.info(f"Response sent to {username}")
+
+            # If conversation is complete, show next steps
+            if result.get('session_complete'):
+                await update.message.reply_text(COMPLETION_MSG, parse_mode=ParseMode.HTML)
+        else:
+            # Fallback response
             await update.message.reply_text(
-                "Sorry, I had a technical hiccup! Please try again or use /reset to start over. 🔧"
+                "I didn't quite catch that. Could you tell me more about what property you're looking for? 🏡"
             )
-    
+
+    async def _on_error(self, update: object, context: ContextTypes.DEFAULT_TYPE):
+        """Central error handler for all registered handlers"""
+        logger.error("Handler error: %s", context.error, exc_info=context.error)
+        if isinstance(update, Update) and update.effective_message:
+            try:
+                await update.effective_message.reply_text(
+                    "Sorry, I had a technical hiccup! Please try again or use /reset to start over. 🔧"
+                )
+            except Exception:
+                pass
+
+    async def _sender_loop(self):
+        """Drain the outbound queue under the global and per-chat rate caps"""
+        last_chat_send = {}
+        loop = asyncio.get_running_loop()
+
+        while True:
+            chat_id, text = await self.send_queue.get()
+            try:
+                wait = last_chat_send.get(chat_id, 0.0) + PER_CHAT_MIN_INTERVAL - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                await self.application.bot.send_message(chat_id=chat_id, text=text)
+                last_chat_send[chat_id] = loop.time()
+            except Exception as e:
+                logger.warning(f"Could not send queued message to {chat_id}: {e}")
+            finally:
+                self.send_queue.task_done()
+
+            await asyncio.sleep(SEND_MIN_INTERVAL)
+
     def add_partner_channel(self, channel_id: int, channel_info: dict):
         """Add a new partner channel"""
         self.partner_channels[channel_id] = channel_info
+        self._partner_ids = frozenset(self.partner_channels)
+        if self.redis is not None:
+            # Write-through so other workers pick the channel up
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop:
+                loop.create_task(
+                    self.redis.hset("partner_channels", str(channel_id), orjson.dumps(channel_info)))
         logger.info(f"Added partner channel: {channel_info.get('name', channel_id)}")
+
+    async def _load_shared_partner_channels(self):
+        """Merge partner channels registered by other workers via Redis"""
+        if self.redis is None:
+            return
+        try:
+            stored = await self.redis.hgetall("partner_channels")
+        except Exception as e:
+            logger.warning(f"Redis partner-channel load failed: {e}")
+            return
+        for channel_id, info in stored.items():
+            try:
+                self.partner_channels.setdefault(int(channel_id), orjson.loads(info))
+            except (ValueError, orjson.JSONDecodeError) as e:
+                logger.warning(f"Skipping malformed partner channel {channel_id}: {e}")
+        self._partner_ids = frozenset(self.partner_channels)
     
     async def start_bot(self):
         """Start the bot"""
@@ -513,25 +809,67 @@ Thank you for using OneMinuta! 🌴"""
         logger.info(f"Storage path: {self.storage_path}")
         logger.info(f"Partner channels: {len(self.partner_channels)}")
         
-        # Start polling
+        await self._load_shared_partner_channels()
+
         await self.application.initialize()
+
+        # Resolve the bot's own identity once; handlers compare against
+        # the cached id instead of going through context.bot per update
+        me = await self.application.bot.get_me()
+        self._self_id = me.id
+        self._bot_username = me.username
+
         await self.application.start()
-        await self.application.updater.start_polling()
-        
+        self._sender_task = asyncio.create_task(self._sender_loop())
+        self._config_watch_task = asyncio.create_task(self._watch_partner_config())
+
+        webhook_url = os.getenv('WEBHOOK_URL')
+        if webhook_url:
+            # High-traffic path: Telegram pushes updates to us directly
+            port = int(os.getenv('PORT', '8443'))
+            await self.application.updater.start_webhook(
+                listen='0.0.0.0',
+                port=port,
+                url_path=self.token,
+                webhook_url=f"{webhook_url.rstrip('/')}/{self.token}",
+                allowed_updates=ALLOWED_UPDATES
+            )
+            logger.info(f"Webhook listening on port {port}")
+        else:
+            # Long polling: a 50s getUpdates timeout means Telegram holds
+            # the request and pushes updates instantly, instead of rapid
+            # empty round-trips
+            await self.application.updater.start_polling(
+                timeout=50,
+                poll_interval=0.0,
+                bootstrap_retries=-1,
+                allowed_updates=ALLOWED_UPDATES
+            )
+
         logger.info("✅ Bot started! Ready for channel integration")
         logger.info("🔗 Add bot to partner channels as admin to enable auto-greeting")
         logger.info("Press Ctrl+C to stop")
-        
-        # Keep running until interrupted
-        try:
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
-            pass
-    
+
+        # Sleep on a real termination signal instead of waking every second
+        import signal
+
+        self._stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGINT, self._stop_event.set)
+        loop.add_signal_handler(signal.SIGTERM, self._stop_event.set)
+
+        await self._stop_event.wait()
+        logger.info("Received interrupt signal, stopping bot...")
+
     async def stop_bot(self):
         """Stop the bot"""
         logger.info("Stopping bot...")
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._sender_task:
+            self._sender_task.cancel()
+        if self._config_watch_task:
+            self._config_watch_task.cancel()
         await self.application.stop()
 
 async def main():
@@ -556,16 +894,10 @@ async def main():
     print(f"🤝 Channel Integration: Enabled")
     print("=" * 50)
     
-    # Create and start bot
+    # Create and start bot. Partner channels come from
+    # config/partner_channels.json and are hot-reloaded on change
     bot = OneMinutaChannelBot(bot_token, openai_key, storage_path)
-    
-    # Add your OneMinuta Property channel
-    bot.add_partner_channel(-1002875386834, {
-        "name": "OneMinuta Property Thailand",
-        "welcome_template": "oneminuta_welcome",
-        "auto_greet": True
-    })
-    
+
     try:
         await bot.start_bot()
     except KeyboardInterrupt:
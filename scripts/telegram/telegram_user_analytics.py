@@ -6,9 +6,13 @@ Provides advanced channel analytics using TELEGRAM_API_ID (User API) instead of
 
 import asyncio
 import os
+import sqlite3
 import sys
 import json
 import logging
+
+import orjson
+from collections import Counter
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
@@ -23,6 +27,7 @@ sys.path.insert(0, str(project_root))
 
 try:
     from telethon import TelegramClient, events
+    from telethon.errors import FloodWaitError
     from telethon.tl.types import (
         Channel, Chat, User, PeerChannel, PeerChat,
         ChatParticipantAdmin, ChatParticipantCreator
@@ -33,6 +38,7 @@ except ImportError:
     print("❌ Telethon not installed. Installing now...")
     os.system("pip install telethon")
     from telethon import TelegramClient, events
+    from telethon.errors import FloodWaitError
     from telethon.tl.types import (
         Channel, Chat, User, PeerChannel, PeerChat,
         ChatParticipantAdmin, ChatParticipantCreator
@@ -49,6 +55,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Participant pagination: pages are fetched concurrently (bounded by the
+# semaphore) under a global requests-per-second cap, instead of one page
+# per second sequentially
+PARTICIPANTS_PAGE_SIZE = 200
+MEMBER_FETCH_CONCURRENCY = 8
+MEMBER_FETCH_PER_SECOND = 5
+
 
 class TelegramUserAnalytics:
     """Advanced Telegram analytics using User API (Telethon)"""
@@ -67,7 +80,17 @@ class TelegramUserAnalytics:
         
         # Initialize Telethon client
         self.client = TelegramClient(str(session_file), self.api_id, self.api_hash)
-        
+
+        # Put the session DB in WAL mode so realtime handlers reading the
+        # session don't serialize against scan/report writes. journal_mode
+        # persists in the file, so Telethon's own connection inherits it
+        try:
+            with sqlite3.connect(str(session_file)) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error as e:
+            logger.warning(f"Could not enable WAL on session DB: {e}")
+
         # Track channels we're monitoring
         self.monitored_channels: Dict[int, Dict] = {}
     
@@ -118,26 +141,63 @@ class TelegramUserAnalytics:
         """Get detailed member list for a channel"""
         try:
             entity = await self.client.get_entity(PeerChannel(channel_id))
-            
+
+            sem = asyncio.Semaphore(MEMBER_FETCH_CONCURRENCY)
+            loop = asyncio.get_running_loop()
+            slot_lock = asyncio.Lock()
+            next_slot = loop.time()
+
+            async def throttle():
+                # Token-bucket pacing shared by all in-flight fetches
+                nonlocal next_slot
+                async with slot_lock:
+                    wait = next_slot - loop.time()
+                    next_slot = max(next_slot, loop.time()) + 1 / MEMBER_FETCH_PER_SECOND
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+            async def fetch(offset):
+                async with sem:
+                    backoff = 1.0
+                    while True:
+                        await throttle()
+                        try:
+                            return await self.client(GetParticipantsRequest(
+                                channel=entity,
+                                filter=ChannelParticipantsRecent(),
+                                offset=offset,
+                                limit=min(PARTICIPANTS_PAGE_SIZE, limit - offset),
+                                hash=0
+                            ))
+                        except FloodWaitError as e:
+                            logger.warning(f"Flood wait {e.seconds}s fetching offset {offset} of channel {channel_id}")
+                            await asyncio.sleep(e.seconds + backoff)
+                            backoff *= 2
+
+            # Entities from get_entity usually carry participants_count=None,
+            # so fetch the first page alone and size the fan-out from the
+            # server-reported total — no empty pages scheduled for small
+            # channels, and the remaining pages still run concurrently
+            first = await fetch(0)
+            if not first.participants:
+                return []
+
+            total = min(limit, first.count or len(first.participants))
+            results = [first]
+            if total > PARTICIPANTS_PAGE_SIZE:
+                results += await asyncio.gather(
+                    *(fetch(offset) for offset in range(PARTICIPANTS_PAGE_SIZE, total, PARTICIPANTS_PAGE_SIZE))
+                )
+
+            # gather preserves offset order, so members come out in the same
+            # order the sequential loop produced
             participants = []
-            offset = 0
-            
-            while len(participants) < limit:
-                batch_size = min(200, limit - len(participants))
-                
-                result = await self.client(GetParticipantsRequest(
-                    channel=entity,
-                    filter=ChannelParticipantsRecent(),
-                    offset=offset,
-                    limit=batch_size,
-                    hash=0
-                ))
-                
-                if not result.participants:
-                    break
-                
+            for result in results:
+                # Index users once per page; the per-participant lookup was
+                # a linear scan over all 200 users of the page
+                users_by_id = {u.id: u for u in result.users}
                 for participant in result.participants:
-                    user = next((u for u in result.users if u.id == participant.user_id), None)
+                    user = users_by_id.get(participant.user_id)
                     if user:
                         member_info = {
                             "user_id": user.id,
@@ -151,15 +211,10 @@ class TelegramUserAnalytics:
                             "is_creator": isinstance(participant, ChatParticipantCreator)
                         }
                         participants.append(member_info)
-                
-                offset += batch_size
-                
-                # Rate limiting
-                await asyncio.sleep(1)
-            
+
             logger.info(f"Retrieved {len(participants)} members from channel {channel_id}")
             return participants
-            
+
         except Exception as e:
             logger.error(f"Error getting members for channel {channel_id}: {e}")
             return []
@@ -176,39 +231,36 @@ class TelegramUserAnalytics:
             # Analyze join patterns
             now = datetime.now(timezone.utc)
             cutoff_date = now - timedelta(days=days)
-            
-            recent_joins = []
-            join_dates = []
-            
+
+            # One pass over the member list: recent-join count, daily and
+            # hourly buckets and bot/premium tallies together, instead of a
+            # join-date scan plus a distribution scan plus two filtering
+            # comprehensions over the same 5000 dicts
+            daily_joins = Counter()
+            hourly_joins = Counter()
+            recent_joins_count = 0
+            bot_count = 0
+            premium_count = 0
+
             for member in members:
-                if member.get('joined_date'):
-                    join_date = member['joined_date']
-                    if hasattr(join_date, 'replace'):
-                        # Convert to UTC if needed
-                        if join_date.tzinfo is None:
-                            join_date = join_date.replace(tzinfo=timezone.utc)
-                        
-                        join_dates.append(join_date)
-                        
-                        if join_date >= cutoff_date:
-                            recent_joins.append(member)
-            
-            # Calculate statistics
+                if member.get('is_bot'):
+                    bot_count += 1
+                if member.get('is_premium'):
+                    premium_count += 1
+
+                join_date = member.get('joined_date')
+                if join_date is not None and hasattr(join_date, 'replace'):
+                    # Convert to UTC if needed
+                    if join_date.tzinfo is None:
+                        join_date = join_date.replace(tzinfo=timezone.utc)
+
+                    if join_date >= cutoff_date:
+                        recent_joins_count += 1
+                        daily_joins[join_date.strftime('%Y-%m-%d')] += 1
+                        hourly_joins[join_date.hour] += 1
+
             total_members = len(members)
-            recent_joins_count = len(recent_joins)
-            
-            # Daily join distribution
-            daily_joins = {}
-            hourly_joins = {}
-            
-            for join_date in join_dates:
-                if join_date >= cutoff_date:
-                    day_key = join_date.strftime('%Y-%m-%d')
-                    hour_key = join_date.hour
-                    
-                    daily_joins[day_key] = daily_joins.get(day_key, 0) + 1
-                    hourly_joins[hour_key] = hourly_joins.get(hour_key, 0) + 1
-            
+
             # Calculate growth rate
             growth_rate = (recent_joins_count / total_members * 100) if total_members > 0 else 0
             
@@ -224,10 +276,10 @@ class TelegramUserAnalytics:
                 "growth_rate_percent": round(growth_rate, 2),
                 "avg_daily_joins": round(avg_daily_joins, 1),
                 "peak_join_hour": peak_hour,
-                "daily_distribution": daily_joins,
-                "hourly_distribution": hourly_joins,
-                "bot_percentage": len([m for m in members if m.get('is_bot')]) / total_members * 100 if total_members > 0 else 0,
-                "premium_percentage": len([m for m in members if m.get('is_premium')]) / total_members * 100 if total_members > 0 else 0,
+                "daily_distribution": dict(daily_joins),
+                "hourly_distribution": dict(hourly_joins),
+                "bot_percentage": bot_count / total_members * 100 if total_members > 0 else 0,
+                "premium_percentage": premium_count / total_members * 100 if total_members > 0 else 0,
                 "analyzed_at": now.isoformat()
             }
             
@@ -357,34 +409,26 @@ class TelegramUserAnalytics:
         """Export complete member list to file"""
         try:
             members = await self.get_channel_members(channel_id, limit=10000)
-            
-            # Clean up data for export
-            export_data = []
-            for member in members:
-                export_data.append({
-                    "user_id": member["user_id"],
-                    "username": member.get("username"),
-                    "first_name": member.get("first_name"),
-                    "last_name": member.get("last_name"),
-                    "is_bot": member.get("is_bot", False),
-                    "is_premium": member.get("is_premium", False),
-                    "joined_date": member.get("joined_date").isoformat() if member.get("joined_date") else None,
-                    "is_admin": member.get("is_admin", False)
-                })
-            
-            # Write to file
+
             output_path = Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "channel_id": channel_id,
-                    "exported_at": datetime.now(timezone.utc).isoformat(),
-                    "total_members": len(export_data),
-                    "members": export_data
-                }, f, indent=2, ensure_ascii=False, default=str)
-            
-            logger.info(f"Exported {len(export_data)} members to {output_file}")
+
+            # Stream the members straight from the fetch result — the dicts
+            # already have the export shape, so the second export_data list
+            # (which doubled peak memory) is gone, and orjson handles the
+            # datetime encoding that previously needed default=str
+            with open(output_path, 'wb') as f:
+                f.write(b'{"channel_id":' + orjson.dumps(channel_id))
+                f.write(b',"exported_at":' + orjson.dumps(datetime.now(timezone.utc).isoformat()))
+                f.write(b',"total_members":' + orjson.dumps(len(members)))
+                f.write(b',"members":[')
+                for i, member in enumerate(members):
+                    if i:
+                        f.write(b',')
+                    f.write(orjson.dumps(member, default=str))
+                f.write(b']}')
+
+            logger.info(f"Exported {len(members)} members to {output_file}")
             return True
             
         except Exception as e:
@@ -3,8 +3,10 @@ Telegram Channel Analytics System for OneMinuta
 Tracks channel growth, member activity, and engagement metrics
 """
 
-import json
+import asyncio
 import logging
+
+import orjson
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict, field
@@ -154,6 +156,14 @@ class ChannelAnalytics:
         self.metrics_cache: Dict[str, ChannelMetrics] = {}
         self.cache_ttl = 300  # 5 minutes
         self.last_cache_update = datetime.now(timezone.utc)
+
+        # Event-write batching: bursts of member events are appended as a
+        # single write per log file once either bound is hit
+        self.event_flush_wait = 0.2     # seconds after the first buffered event
+        self.event_flush_max_rows = 100
+        self._event_buf: Dict[Path, List[str]] = defaultdict(list)
+        self._buffered_events = 0
+        self._flush_handle = None
     
     async def track_member_event(self, channel_id: str, channel_name: str,
                                 user_id: str, event_type: MemberEventType,
@@ -184,19 +194,48 @@ class ChannelAnalytics:
         await self._check_growth_alerts(channel_id, event)
     
     async def _store_event(self, event: MemberEvent) -> None:
-        """Store member event to disk"""
-        
+        """Buffer a member event; batches are appended to the daily log in
+        one write per file"""
+
         # Daily event log per channel
         date_str = event.timestamp.strftime("%Y-%m-%d")
         event_file = self.analytics_path / event.channel_id / "events" / f"{date_str}.ndjson"
-        event_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Append event as newline-delimited JSON
+
+        # Serialize now so the buffered line is immutable
         event_data = asdict(event)
         event_data["timestamp"] = event.timestamp.isoformat()
-        
-        with open(event_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(event_data, ensure_ascii=False) + "\n")
+        self._event_buf[event_file].append(orjson.dumps(event_data).decode('utf-8'))
+        self._buffered_events += 1
+
+        if self._buffered_events >= self.event_flush_max_rows:
+            self._flush_events()
+        elif self._flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No loop to defer on — write through
+                self._flush_events()
+                return
+            self._flush_handle = loop.call_later(self.event_flush_wait, self._flush_events)
+
+    def _flush_events(self) -> None:
+        """Write all buffered events, one append per daily log file"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._buffered_events:
+            return
+
+        buf, self._event_buf = self._event_buf, defaultdict(list)
+        self._buffered_events = 0
+
+        for event_file, lines in buf.items():
+            try:
+                event_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(event_file, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+            except OSError as e:
+                self.logger.error(f"Error flushing {len(lines)} events to {event_file}: {e}")
     
     async def _update_member_profile(self, event: MemberEvent) -> None:
         """Update or create member profile"""
@@ -205,8 +244,8 @@ class ChannelAnalytics:
         profile_file.parent.mkdir(parents=True, exist_ok=True)
         
         if profile_file.exists():
-            with open(profile_file, "r", encoding="utf-8") as f:
-                profile_data = json.load(f)
+            with open(profile_file, "rb") as f:
+                profile_data = orjson.loads(f.read())
                 profile = MemberProfile(**profile_data)
         else:
             profile = MemberProfile(
@@ -232,8 +271,8 @@ class ChannelAnalytics:
         profile_data["join_date"] = profile.join_date.isoformat()
         profile_data["last_active"] = profile.last_active.isoformat()
         
-        with open(profile_file, "w", encoding="utf-8") as f:
-            json.dump(profile_data, f, indent=2, ensure_ascii=False)
+        with open(profile_file, "wb") as f:
+            f.write(orjson.dumps(profile_data, option=orjson.OPT_INDENT_2))
         
         # Update cache
         self.member_cache[event.user_id] = profile
@@ -338,8 +377,8 @@ class ChannelAnalytics:
         
         metrics_data = asdict(metrics)
         
-        with open(metrics_file, "w", encoding="utf-8") as f:
-            json.dump(metrics_data, f, indent=2, ensure_ascii=False, default=str)
+        with open(metrics_file, "wb") as f:
+            f.write(orjson.dumps(metrics_data, option=orjson.OPT_INDENT_2, default=str))
         
         # Update cache
         self.metrics_cache[channel_id] = metrics
@@ -365,8 +404,8 @@ class ChannelAnalytics:
             "hot_leads": metrics.hot_leads_generated
         }
         
-        with open(snapshot_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(snapshot) + "\n")
+        with open(snapshot_file, "ab") as f:
+            f.write(orjson.dumps(snapshot) + b"\n")
     
     async def get_channel_metrics(self, channel_id: str, 
                                  channel_name: str = None, telegram_bot=None) -> ChannelMetrics:
@@ -381,8 +420,8 @@ class ChannelAnalytics:
         metrics_file = self.analytics_path / channel_id / "metrics.json"
         
         if metrics_file.exists():
-            with open(metrics_file, "r", encoding="utf-8") as f:
-                metrics_data = json.load(f)
+            with open(metrics_file, "rb") as f:
+                metrics_data = orjson.loads(f.read())
                 metrics = ChannelMetrics(**metrics_data)
         else:
             # Create new metrics with real member count from Telegram
@@ -471,8 +510,8 @@ class ChannelAnalytics:
             alert["timestamp"] = datetime.now(timezone.utc).isoformat()
             alert["channel_id"] = channel_id
             
-            with open(alerts_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(alert) + "\n")
+            with open(alerts_file, "ab") as f:
+                f.write(orjson.dumps(alert) + b"\n")
             
             self.logger.info(f"{alert['severity'].upper()}: {alert['message']}")
     
@@ -590,8 +629,10 @@ class ChannelAnalytics:
         report_file = self.analytics_path / channel_id / "reports" / f"{now.strftime('%Y-%m-%d')}_report.json"
         report_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(report_file, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        with open(report_file, "wb") as f:
+            # Distribution buckets are keyed by ints; stringify like stdlib
+            # json did
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         return report
     
@@ -599,6 +640,9 @@ class ChannelAnalytics:
                                      start: datetime, end: datetime) -> List[Dict]:
         """Load events for a specific period"""
         
+        # Land any buffered events first so reports see their own writes
+        self._flush_events()
+
         events = []
         events_dir = self.analytics_path / channel_id / "events"
         
@@ -611,14 +655,14 @@ class ChannelAnalytics:
             event_file = events_dir / f"{current.strftime('%Y-%m-%d')}.ndjson"
             
             if event_file.exists():
-                with open(event_file, "r", encoding="utf-8") as f:
+                with open(event_file, "rb") as f:
                     for line in f:
                         try:
-                            event = json.loads(line)
+                            event = orjson.loads(line)
                             event_time = datetime.fromisoformat(event["timestamp"])
                             if start <= event_time <= end:
                                 events.append(event)
-                        except (json.JSONDecodeError, KeyError):
+                        except (orjson.JSONDecodeError, KeyError):
                             continue
             
             current += timedelta(days=1)
@@ -930,8 +974,8 @@ class ChannelAnalytics:
         date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         events_file = partner_dir / f"events_{date_str}.ndjson"
         
-        with open(events_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(partner_event) + "\n")
+        with open(events_file, "ab") as f:
+            f.write(orjson.dumps(partner_event) + b"\n")
 
 
 # Integration with Telegram bot
@@ -6,6 +6,7 @@ Monitors Telegram channels and extracts client signals in real-time
 import asyncio
 import json
 import logging
+import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set
 from pathlib import Path
@@ -21,6 +22,47 @@ except ImportError:
 from .client_analyzer import PropertyClientAnalyzer, ClientSignal, EngagementType
 
 
+def _keyword_union(words) -> "re.Pattern":
+    """Compile literal keywords into one alternation regex: a single scan
+    per message instead of one substring pass per keyword. Longer
+    alternatives first so overlapping keywords match their most specific
+    form."""
+    return re.compile("|".join(
+        re.escape(w) for w in sorted(words, key=len, reverse=True)))
+
+
+# Owner-message keyword tables, compiled once at import (these run on every
+# monitored message)
+
+# Promotional/channel content indicators
+_PROMO_RE = _keyword_union([
+    'подписывайтесь', 'subscribe', 'смотрим', 'watch', 'youtube', 'видео',
+    'ролик', 'выпуск', '➡️', '✅', '✔️', '#', 'hashtag', 'канал',
+    'channel', 'новый выпуск', 'рассказываем', 'разбираемся'
+])
+
+# Property listing indicators (owner behavior)
+_LISTING_RE = _keyword_union([
+    'for sale', 'for rent', 'available', 'price:', '฿', 'thb', 'baht',
+    'bedroom', 'bathroom', 'sqm', 'sq.m', 'square meter',
+    'contact:', 'call:', 'line:', 'whatsapp:', 'tel:', 'phone:',
+    'продается', 'сдается', 'цена:', 'спальн', 'ванн', 'кв.м',
+    'контакт:', 'звонить:', 'телефон:'
+])
+
+# Marketing/promotional content indicators
+_MARKETING_RE = _keyword_union([
+    'ипотеку', 'рассрочку', 'financing', 'mortgage', 'installment',
+    'документы', 'documents', 'как купить', 'how to buy',
+    'инвестиции', 'investment'
+])
+
+_LINK_RE = _keyword_union(['http', 'youtube', 'vk.com', 't.me'])
+_PRICE_RE = _keyword_union(['price:', '฿', 'thb', 'million', 'цена:'])
+_CONTACT_RE = _keyword_union(['contact:', 'call:', 'line:', 'tel:', 'контакт:'])
+_FORMAT_TOKENS = ('**', '✅', '➡️', '✔️')
+
+
 class TelegramPropertyMonitor:
     """Monitors Telegram channels for property client activity"""
     
@@ -42,61 +84,39 @@ class TelegramPropertyMonitor:
         self.config_path = self.storage_path / "config" / "monitor_config.json"
         self.load_config()
     
-    def is_likely_owner_message(self, text: str) -> bool:
-        """Detect if message is likely from channel owner/admin based on content patterns"""
-        text_lower = text.lower()
-        
-        # Promotional/channel content indicators
-        promotional_indicators = [
-            'подписывайтесь', 'subscribe', 'смотрим', 'watch', 'youtube', 'видео',
-            'ролик', 'выпуск', '➡️', '✅', '✔️', '#', 'hashtag', 'канал',
-            'channel', 'новый выпуск', 'рассказываем', 'разбираемся'
-        ]
-        
-        # Property listing indicators (owner behavior)
-        listing_indicators = [
-            'for sale', 'for rent', 'available', 'price:', '฿', 'thb', 'baht',
-            'bedroom', 'bathroom', 'sqm', 'sq.m', 'square meter',
-            'contact:', 'call:', 'line:', 'whatsapp:', 'tel:', 'phone:',
-            'продается', 'сдается', 'цена:', 'спальн', 'ванн', 'кв.м',
-            'контакт:', 'звонить:', 'телефон:'
-        ]
-        
-        # Marketing/promotional content indicators
-        marketing_indicators = [
-            'ипотеку', 'рассрочку', 'financing', 'mortgage', 'installment',
-            'документы', 'documents', 'как купить', 'how to buy',
-            'инвестиции', 'investment'
-        ]
-        
+    def is_likely_owner_message(self, text: str, text_lower: str = None) -> bool:
+        """Detect if message is likely from channel owner/admin based on content patterns
+
+        Callers that already lowercased the text can pass it to skip the
+        extra allocation."""
+        if text_lower is None:
+            text_lower = text.lower()
+
         # Check for promotional content (contains links, hashtags, formatting)
-        has_promo = any(promo in text_lower for promo in promotional_indicators)
+        has_promo = _PROMO_RE.search(text_lower) is not None
         has_hashtag = '#' in text
-        has_link = any(link in text_lower for link in ['http', 'youtube', 'vk.com', 't.me'])
-        has_formatting = any(fmt in text for fmt in ['**', '✅', '➡️', '✔️'])
-        
+        has_link = _LINK_RE.search(text_lower) is not None
+        has_formatting = any(fmt in text for fmt in _FORMAT_TOKENS)
+
         if has_promo or has_hashtag or (has_link and len(text) > 100) or has_formatting:
             return True
-        
-        # Check if message contains multiple listing indicators
-        indicator_count = sum(1 for indicator in listing_indicators if indicator in text_lower)
-        marketing_count = sum(1 for indicator in marketing_indicators if indicator in text_lower)
-        
-        # Long messages with multiple indicators are likely listings/promotional
-        if len(text) > 200 and (indicator_count >= 2 or marketing_count >= 1):
-            return True
-        
-        # Messages with price and contact info are likely listings  
-        has_price = any(price_word in text_lower for price_word in ['price:', '฿', 'thb', 'million', 'цена:'])
-        has_contact = any(contact_word in text_lower for contact_word in ['contact:', 'call:', 'line:', 'tel:', 'контакт:'])
-        
-        if has_price and has_contact:
+
+        # Long messages with multiple listing indicators (or any marketing
+        # language) are likely listings/promotional
+        if len(text) > 200:
+            # Stop scanning as soon as a second distinct indicator shows up
+            listing_hits = set()
+            for match in _LISTING_RE.finditer(text_lower):
+                listing_hits.add(match.group())
+                if len(listing_hits) >= 2:
+                    break
+            if len(listing_hits) >= 2 or _MARKETING_RE.search(text_lower):
+                return True
+
+        # Messages with price and contact info are likely listings
+        if _PRICE_RE.search(text_lower) and _CONTACT_RE.search(text_lower):
             return True
-        
-        # Very short messages are likely member comments
-        if len(text.strip()) < 50:
-            return False
-            
+
         return False
     
     def load_config(self):
@@ -368,13 +388,15 @@ class TelegramPropertyMonitor:
                 self.logger.info(f"Collecting ALL messages from last {days_back} days (since {cutoff_date.strftime('%Y-%m-%d')})")
             
             message_count = 0
-            async for message in self.client.iter_messages(entity, limit=limit):
+            # Batch fetch instead of iter_messages: one round-trip returns the
+            # whole bounded batch, and the loop below runs without awaits
+            for message in await self.client.get_messages(entity, limit=limit):
                 if message.text and message.sender:
                     # Check if message is within date range
                     if cutoff_date and message.date and message.date.replace(tzinfo=None) < cutoff_date:
                         self.logger.info(f"Reached cutoff date, stopping at {message.date.strftime('%Y-%m-%d %H:%M')}")
                         break
-                    
+
                     # Include ALL messages (no filtering for property collection)
                     messages.append({
                         'user_id': str(message.sender.id),
@@ -4,33 +4,111 @@ Chatbot Session Manager
 Handles persistent storage and retrieval of conversation sessions.
 """
 
-import json
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Optional
+
+import aiofiles
+import orjson
+
 from libs.permissions import get_user_roles, get_user_channel
 
+# In-process session cache bounds: sessions of users idle longer than the
+# TTL are re-read from disk, and the least recently used entries are
+# evicted once the cache is full
+_CACHE_MAX_USERS = 10_000
+_CACHE_TTL_SECONDS = 3600
+
 
 class ChatbotSessionManager:
-    """Manages chatbot conversation sessions with file-based persistence"""
-    
+    """Manages chatbot conversation sessions with file-based persistence
+    and an in-process write-behind cache, so chatty users don't pay a
+    JSON deserialize/serialize round-trip per message"""
+
     def __init__(self, storage_path: str):
         self.storage_path = Path(storage_path)
         self.sessions_dir = self.storage_path / "chatbot" / "sessions"
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
         self.logger = logging.getLogger(__name__)
-        
+
+        # LRU of live sessions plus write-behind bookkeeping: _dirty holds
+        # the latest serialized snapshot per user, _pending the single
+        # flush task draining it
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._last_seen: Dict[str, float] = {}
+        self._dirty: Dict[str, bytes] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+
         self.logger.info(f"ChatbotSessionManager initialized with storage: {self.sessions_dir}")
-    
+
+    def _cache_put(self, user_id: str, session: Dict):
+        """Insert/refresh a session in the LRU, evicting the oldest entries"""
+        self._cache[user_id] = session
+        self._cache.move_to_end(user_id)
+        self._last_seen[user_id] = time.monotonic()
+        while len(self._cache) > _CACHE_MAX_USERS:
+            evicted, _ = self._cache.popitem(last=False)
+            self._last_seen.pop(evicted, None)
+
+    def _cache_get(self, user_id: str) -> Optional[Dict]:
+        session = self._cache.get(user_id)
+        if session is None:
+            return None
+        if time.monotonic() - self._last_seen[user_id] > _CACHE_TTL_SECONDS:
+            self._cache.pop(user_id)
+            self._last_seen.pop(user_id, None)
+            return None
+        self._cache.move_to_end(user_id)
+        self._last_seen[user_id] = time.monotonic()
+        return session
+
+    async def _flush(self, user_id: str):
+        """Drain pending snapshots for one user; coalesces bursts so only
+        the latest state hits the disk"""
+        session_file = self.sessions_dir / f"{user_id}.json"
+        try:
+            while True:
+                payload = self._dirty.pop(user_id, None)
+                if payload is None:
+                    break
+                try:
+                    async with aiofiles.open(session_file, 'wb') as f:
+                        await f.write(payload)
+                except OSError as e:
+                    self.logger.error(f"Error saving session for {user_id}: {e}")
+        finally:
+            self._pending.pop(user_id, None)
+
+    async def _wait_for_flush(self, user_id: str):
+        """Let any in-flight write finish (dropping queued snapshots)"""
+        self._dirty.pop(user_id, None)
+        task = self._pending.get(user_id)
+        if task:
+            try:
+                await task
+            except Exception:
+                pass
+
     async def get_session(self, user_id: str) -> Dict:
         """Get existing session or create new one"""
+        cached = self._cache_get(user_id)
+        if cached is not None:
+            # Update roles and channel info on each access (in case they changed)
+            cached['roles'] = get_user_roles(user_id)
+            if 'partner' in cached['roles']:
+                cached['channel_id'] = get_user_channel(user_id)
+            return cached
+
         session_file = self.sessions_dir / f"{user_id}.json"
-        
+
         if session_file.exists():
             try:
-                with open(session_file, 'r', encoding='utf-8') as f:
-                    session = json.load(f)
+                with open(session_file, 'rb') as f:
+                    session = orjson.loads(f.read())
                 
                 # Update roles and channel info on each load (in case they changed)
                 session['roles'] = get_user_roles(user_id)
@@ -38,8 +116,9 @@ class ChatbotSessionManager:
                     session['channel_id'] = get_user_channel(user_id)
                 
                 self.logger.debug(f"Loaded existing session for {user_id}")
+                self._cache_put(user_id, session)
                 return session
-            except (json.JSONDecodeError, FileNotFoundError) as e:
+            except (orjson.JSONDecodeError, FileNotFoundError) as e:
                 self.logger.warning(f"Error loading session for {user_id}: {e}")
                 # Fall through to create new session
         
@@ -66,20 +145,23 @@ class ChatbotSessionManager:
         return session
     
     async def save_session(self, user_id: str, session: Dict) -> bool:
-        """Save session to persistent storage"""
+        """Save session: update the cache immediately, flush to disk
+        asynchronously (write-behind)"""
         try:
-            session_file = self.sessions_dir / f"{user_id}.json"
-            
             # Update last_active timestamp
             session['last_active'] = datetime.now(timezone.utc).isoformat()
-            
-            # Write session to file
-            with open(session_file, 'w', encoding='utf-8') as f:
-                json.dump(session, f, indent=2, ensure_ascii=False)
-            
+
+            self._cache_put(user_id, session)
+
+            # Snapshot now so later mutations don't leak into this write;
+            # one flush task per user drains the latest snapshot
+            self._dirty[user_id] = orjson.dumps(session, option=orjson.OPT_INDENT_2)
+            if user_id not in self._pending:
+                self._pending[user_id] = asyncio.create_task(self._flush(user_id))
+
             self.logger.debug(f"Saved session for {user_id}")
             return True
-            
+
         except Exception as e:
             self.logger.error(f"Error saving session for {user_id}: {e}")
             return False
@@ -87,6 +169,12 @@ class ChatbotSessionManager:
     async def clear_session(self, user_id: str) -> bool:
         """Clear/reset session for user"""
         try:
+            # Drop the cached copy and let any in-flight write land before
+            # archiving, so the flush can't resurrect the file afterwards
+            await self._wait_for_flush(user_id)
+            self._cache.pop(user_id, None)
+            self._last_seen.pop(user_id, None)
+
             session_file = self.sessions_dir / f"{user_id}.json"
             
             if session_file.exists():
@@ -118,8 +206,8 @@ class ChatbotSessionManager:
                     
                 user_id = session_file.stem
                 try:
-                    with open(session_file, 'r', encoding='utf-8') as f:
-                        session = json.load(f)
+                    with open(session_file, 'rb') as f:
+                        session = orjson.loads(f.read())
                     
                     # Include basic session info
                     sessions[user_id] = {
@@ -131,7 +219,7 @@ class ChatbotSessionManager:
                         'created_at': session.get('created_at')
                     }
                     
-                except (json.JSONDecodeError, KeyError) as e:
+                except (orjson.JSONDecodeError, KeyError) as e:
                     self.logger.warning(f"Error reading session {user_id}: {e}")
                     continue
             
@@ -155,8 +243,8 @@ class ChatbotSessionManager:
                     continue
                 
                 try:
-                    with open(session_file, 'r', encoding='utf-8') as f:
-                        session = json.load(f)
+                    with open(session_file, 'rb') as f:
+                        session = orjson.loads(f.read())
                     
                     last_active_str = session.get('last_active')
                     if last_active_str:
@@ -169,7 +257,7 @@ class ChatbotSessionManager:
                             cleaned_count += 1
                             self.logger.info(f"Cleaned up inactive session: {user_id}")
                 
-                except (json.JSONDecodeError, ValueError) as e:
+                except (orjson.JSONDecodeError, ValueError) as e:
                     self.logger.warning(f"Error processing session {session_file.name}: {e}")
                     continue
             
@@ -4,10 +4,12 @@ Integrates extracted properties with OneMinuta's asset storage system
 Uses new storage structure with improved performance and symlinks
 """
 
+import fcntl
 import json
 import hashlib
 import logging
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 import sys
@@ -391,21 +393,26 @@ class AssetManager:
 
         return asset_data
     
-    def _create_nested_path(self, prefix: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _create_nested_path(prefix: str) -> str:
         """Convert SpheriCode prefix to nested directory path
-        
+
         Examples:
         '3G' -> '3/g'
-        '3G6F' -> '3/g/6/f'  
+        '3G6F' -> '3/g/6/f'
         '3G6FBS' -> '3/g/6/f/b/s'
         '3G6FBSR' -> '3/g/6/f/b/s/r'
+
+        Cached: assets cluster geographically, so the same handful of
+        prefixes is converted over and over during a collection run.
         """
         if not prefix:
             return ""
-        
+
         # Convert to lowercase and split into individual characters
         chars = list(prefix.lower())
-        
+
         # Join with path separator
         return "/".join(chars)
     
@@ -577,9 +584,10 @@ class AssetManager:
     def _update_geo_cell_index(self, geo_cell_dir: Path, asset_ref: dict):
         """Update the index.json for a geo cell"""
         index_file = geo_cell_dir / "index.json"
-        
+        is_new_cell = not index_file.exists()
+
         # Load existing index
-        if index_file.exists():
+        if not is_new_cell:
             with open(index_file, "r", encoding="utf-8") as f:
                 index = json.load(f)
         else:
@@ -630,6 +638,28 @@ class AssetManager:
         with open(index_file, "w", encoding="utf-8") as f:
             json.dump(index, f, indent=2, ensure_ascii=False, default=str)
 
+        # Keep the running cell counter in sync so stats() can read one int
+        # instead of walking the whole geo tree
+        if is_new_cell:
+            self._bump_geo_cell_count()
+
+    def _bump_geo_cell_count(self):
+        """Increment the persistent geo cell counter (geo/_count.txt)"""
+        count_file = self.storage_path / "geo" / "_count.txt"
+
+        try:
+            count_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(count_file, "a+b") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                f.seek(0)
+                raw = f.read().strip()
+                count = int(raw) if raw else 0
+                f.seek(0)
+                f.truncate()
+                f.write(str(count + 1).encode())
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not update geo cell counter: {e}")
+
     def _update_global_index(self, asset_data: dict):
         """Update global asset index"""
         global_index_file = self.global_path / "asset_index.json"
@@ -15,8 +15,9 @@ from spherical import (
     inside_cap, inside_cap_batch, sort_by_dot, bounding_box
 )
 from sphericode import (
-    encode_sphericode, decode_sphericode, suggest_prefix_len_for_radius,
-    prefixes_for_query, morton_encode, morton_decode
+    encode_sphericode, encode_sphericode_batch, decode_sphericode,
+    suggest_prefix_len_for_radius, prefixes_for_query,
+    morton_encode, morton_decode
 )
 
 
@@ -166,6 +167,26 @@ class TestSpheriCode:
         with pytest.raises(ValueError):
             encode_sphericode(0, 0, 0)  # Invalid bits_per_axis
     
+    def test_encode_sphericode_batch_matches_scalar(self):
+        """Batch encoder must agree with the scalar encoder element-wise"""
+        import random
+        rng = random.Random(42)
+
+        lats = [rng.uniform(-90, 90) for _ in range(100)] + [-90, 0, 90]
+        lons = [rng.uniform(-180, 180) for _ in range(100)] + [-180, 0, 180]
+
+        for bits in [8, 16, 26]:
+            batch = encode_sphericode_batch(lats, lons, bits)
+            scalar = [encode_sphericode(lat, lon, bits) for lat, lon in zip(lats, lons)]
+            assert batch == scalar
+
+        # Bounds checking matches the scalar encoder too
+        with pytest.raises(ValueError):
+            encode_sphericode_batch([91], [0])
+
+        with pytest.raises(ValueError):
+            encode_sphericode_batch([0], [0], 0)
+
     def test_decode_sphericode_roundtrip(self):
         """Test encode/decode roundtrip accuracy"""
         test_points = [